@@ -9,7 +9,8 @@ import sys
 from pathlib import Path
 from loguru import logger
 from pyrogram import Client
-import os
+
+from src.config_loader import load_proxy_from_env
 
 # 配置日志
 logger.remove()
@@ -39,19 +40,9 @@ async def debug_monitor():
     logger.info("=" * 60)
 
     # 检查代理
-    proxy = None
-    http_proxy = os.environ.get('http_proxy') or os.environ.get('HTTP_PROXY')
-    if http_proxy:
-        logger.info(f"检测到代理: {http_proxy}")
-        if http_proxy.startswith('http://'):
-            proxy_url = http_proxy[7:]
-            if ':' in proxy_url:
-                hostname, port = proxy_url.split(':')
-                proxy = {
-                    "scheme": "http",
-                    "hostname": hostname,
-                    "port": int(port)
-                }
+    proxy = load_proxy_from_env()
+    if proxy:
+        logger.info(f"检测到代理: {proxy['scheme']}://{proxy['hostname']}:{proxy['port']}")
 
     # 创建客户端（与 test_monitor.py 完全相同的方式）
     app = Client(session_file, api_id=api_id, api_hash=api_hash, proxy=proxy)
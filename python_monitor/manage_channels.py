@@ -21,8 +21,11 @@
 """
 
 import argparse
+import re
+import shutil
 import sys
 import os
+import tempfile
 from pathlib import Path
 
 # 添加项目路径
@@ -31,6 +34,9 @@ sys.path.insert(0, str(project_root))
 
 from src.config_loader import load_config
 
+# 配置文件中的 channel_ids 项，包括缩进的续行（及续行之间的空行）
+CHANNEL_IDS_LINE = re.compile(r'^channel_ids[ \t]*[=:].*(?:\n(?:[ \t]*\n)*[ \t]+\S.*)*', re.MULTILINE)
+
 
 def display_channels(config):
     """显示当前频道列表"""
@@ -61,8 +67,9 @@ def add_channel_to_config(config_file, channel_id, channel_name=None):
         print(f"⚠️  频道 {channel_id} 已在监控列表中")
         return False
 
-    channel_ids.append(channel_id)
-    channel_ids.sort()
+    # load_config 返回 array.array，转换为列表后排序
+    channel_ids = sorted([*channel_ids, channel_id])
+    config['telegram']['channel_ids'] = channel_ids
 
     # 更新配置文件
     update_config_file(config_file, config)
@@ -111,19 +118,31 @@ def update_channels_in_config(config_file, new_channel_ids):
 
 
 def update_config_file(config_file, config):
-    """更新配置文件"""
-    import configparser
+    """更新配置文件（只替换 channel_ids 一行，保留其余内容和注释）"""
+    channel_ids = config['telegram']['channel_ids']
+    new_line = 'channel_ids = ' + ','.join(str(cid) for cid in channel_ids)
 
-    parser = configparser.ConfigParser()
-    parser.read(config_file)
+    with open(config_file, 'r', encoding='utf-8') as f:
+        text = f.read()
 
-    # 更新 channel_ids
-    channel_ids = config['telegram']['channel_ids']
-    parser.set('telegram', 'channel_ids', ','.join(str(cid) for cid in channel_ids))
+    text, count = CHANNEL_IDS_LINE.subn(lambda _: new_line, text, count=1)
+    if count == 0:
+        raise ValueError(f"配置文件中未找到 channel_ids: {config_file}")
 
-    # 写回文件
-    with open(config_file, 'w') as f:
-        parser.write(f)
+    # 先写临时文件再原子替换，监听方不会读到写了一半的配置
+    config_dir = os.path.dirname(os.path.abspath(config_file))
+    tmp = tempfile.NamedTemporaryFile(
+        'w', encoding='utf-8', dir=config_dir, suffix='.tmp', delete=False
+    )
+    try:
+        # 写入或关闭（刷盘）失败时同样删除临时文件，不在配置目录留下残片
+        with tmp:
+            tmp.write(text)
+        shutil.copymode(config_file, tmp.name)
+        os.replace(tmp.name, config_file)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
 
     print(f"\n💾 配置文件已更新: {config_file}")
 
@@ -8,7 +8,6 @@ Telegram 频道监控器
 3. 自动重试和错误处理
 """
 
-import configparser
 import sys
 from pathlib import Path
 from loguru import logger
@@ -28,24 +27,31 @@ logger.add(
     format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{message}</cyan>",
     level="INFO"  # 改为INFO级别，减少调试信息
 )
-logger.add("monitor.log", rotation="500 MB", retention="10 days", level="DEBUG")
+# enqueue=True: 由后台线程写文件，日志轮转不会阻塞事件循环
+logger.add("monitor.log", rotation="500 MB", retention="10 days", level="DEBUG", enqueue=True)
 
-# ✅ 配置Pyrogram日志 - 详细调试模式，捕获所有消息事件
 import logging
-# 设置Pyrogram为DEBUG级别，捕获所有消息和事件
+import os
+
 pyrogram_logger = logging.getLogger("pyrogram")
-pyrogram_logger.setLevel(logging.DEBUG)
-
-# 创建控制台处理器，显示重要Pyrogram信息
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-formatter = logging.Formatter('%(asctime)s | PYROGRAM | %(levelname)s | %(message)s')
-console_handler.setFormatter(formatter)
-pyrogram_logger.addHandler(console_handler)
-
-# ✅ 配置HTTP日志 - 显示发送相关日志
-http_logger = logging.getLogger("urllib3")
-http_logger.setLevel(logging.INFO)  # 显示HTTP发送相关信息
+
+if os.environ.get("MONITOR_DEBUG") == "1":
+    # ✅ 调试模式 - Pyrogram DEBUG 级别，捕获所有消息和事件
+    pyrogram_logger.setLevel(logging.DEBUG)
+
+    # 创建控制台处理器，显示重要Pyrogram信息
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    formatter = logging.Formatter('%(asctime)s | PYROGRAM | %(levelname)s | %(message)s')
+    console_handler.setFormatter(formatter)
+    pyrogram_logger.addHandler(console_handler)
+
+    # ✅ 配置HTTP日志 - 显示发送相关日志
+    http_logger = logging.getLogger("urllib3")
+    http_logger.setLevel(logging.INFO)  # 显示HTTP发送相关信息
+else:
+    # 默认只保留 Pyrogram 警告，避免高消息量时逐个格式化原始 TL 对象
+    pyrogram_logger.setLevel(logging.WARNING)
 
 logger.info("✅ 日志配置完成 - 显示消息捕获和HTTP发送，隐藏网络心跳包")
 
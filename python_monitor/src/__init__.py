@@ -0,0 +1 @@
+# Python Monitor 源码包
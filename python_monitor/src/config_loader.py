@@ -2,8 +2,48 @@
 配置加载模块
 """
 
-import configparser
-from pathlib import Path
+import array
+import copy
+import functools
+import os
+from typing import Dict, Optional
+
+from src import fast_config
+from src.proxy import parse_proxy
+
+# 已解析配置缓存: 配置文件路径 -> (对应的原始配置, 配置字典)
+# 原始配置对象随 _RAW_CACHE 一起失效，两级缓存共用同一次 stat 判断
+_CACHE = {}
+
+# 原始配置缓存: 配置文件路径 -> (修改时间, {节: {键: 值}})
+_RAW_CACHE = {}
+
+# 按优先级读取的代理环境变量
+_PROXY_ENV_VARS = ('https_proxy', 'HTTPS_PROXY', 'http_proxy', 'HTTP_PROXY', 'all_proxy', 'ALL_PROXY')
+
+
+def get_config(config_file) -> Dict[str, Dict[str, str]]:
+    """
+    读取配置文件为 {节: {键: 值}} 的普通字典，文件未修改时直接返回缓存
+
+    返回的字典在所有调用方之间共享，调用方不应修改
+
+    Args:
+        config_file: 配置文件路径
+
+    Returns:
+        dict: 各节的键值对（值均为字符串）
+    """
+    path = str(config_file)
+    mtime = os.stat(path).st_mtime_ns
+    cached_mtime, cached = _RAW_CACHE.get(path, (None, None))
+    if cached_mtime == mtime:
+        return cached
+
+    sections = fast_config.parse(path)
+
+    _RAW_CACHE[path] = (mtime, sections)
+    return sections
 
 
 def load_config(config_file):
@@ -16,13 +56,15 @@ def load_config(config_file):
     Returns:
         dict: 配置字典
     """
-    config_path = Path(config_file)
+    try:
+        config = get_config(config_file)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"配置文件不存在: {config_file}") from None
 
-    if not config_path.exists():
-        raise FileNotFoundError(f"配置文件不存在: {config_file}")
-
-    config = configparser.ConfigParser()
-    config.read(config_file, encoding='utf-8')
+    # 原始配置未重新解析（文件未修改）时直接返回缓存（返回副本，调用方可以自由修改）
+    cached_raw, cached = _CACHE.get(str(config_file), (None, None))
+    if cached_raw is config:
+        return copy.deepcopy(cached)
 
     # 解析 channel_ids 为列表
     channel_ids_str = config['telegram']['channel_ids']
@@ -35,8 +77,11 @@ def load_config(config_file):
             except ValueError:
                 raise ValueError(f"无效的频道 ID: {channel_id}")
 
+    # 以连续的 int64 缓冲区保存，频道数量很多时比 list[int] 节省 3-4 倍内存
+    channel_ids = array.array('q', channel_ids)
+
     # 构建配置字典
-    return {
+    result = {
         'telegram': {
             'api_id': int(config['telegram']['api_id']),
             'api_hash': config['telegram']['api_hash'],
@@ -47,6 +92,7 @@ def load_config(config_file):
             'url': config['rust_service']['url'],
             'max_retries': int(config['rust_service'].get('max_retries', '3')),
             'timeout': int(config['rust_service'].get('timeout', '30')),
+            'rate_limit': float(config['rust_service'].get('rate_limit', '0')),
         },
         'logging': {
             'level': config['logging']['level'],
@@ -54,6 +100,24 @@ def load_config(config_file):
         }
     }
 
+    _CACHE[str(config_file)] = (config, result)
+    return copy.deepcopy(result)
+
+
+@functools.lru_cache(maxsize=1)
+def load_proxy_from_env() -> Optional[Dict]:
+    """
+    读取代理环境变量（https_proxy > http_proxy > all_proxy）并解析，结果在进程内缓存
+
+    Returns:
+        dict: Pyrogram 的 proxy 参数；未设置或无法解析时返回 None
+    """
+    for name in _PROXY_ENV_VARS:
+        url = os.environ.get(name)
+        if url:
+            return parse_proxy(url)
+    return None
+
 
 def create_sample_config():
     """创建配置文件示例"""
@@ -7,6 +7,37 @@ import threading
 import time
 from loguru import logger
 
+# watchdog 基于 inotify/kqueue 等系统事件通知，未安装时回退到定时轮询
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+
+class _ConfigFileEventHandler(FileSystemEventHandler):
+    """将配置文件所在目录的事件转发给 ConfigReloader"""
+
+    def __init__(self, reloader):
+        super().__init__()
+        self.reloader = reloader
+        self.config_path = os.path.abspath(reloader.config_file)
+
+    def _dispatch_if_config(self, path):
+        if os.path.abspath(path) == self.config_path:
+            self.reloader._check_file()
+
+    def on_modified(self, event):
+        self._dispatch_if_config(event.src_path)
+
+    def on_created(self, event):
+        self._dispatch_if_config(event.src_path)
+
+    def on_moved(self, event):
+        # 编辑器/原子写入通过临时文件 rename 覆盖配置文件
+        self._dispatch_if_config(event.dest_path)
+
 
 class ConfigReloader:
     """配置文件热重载器"""
@@ -24,18 +55,30 @@ class ConfigReloader:
         self.last_modified = 0
         self.running = False
         self.thread = None
+        self.observer = None
 
     def start(self, check_interval=5):
         """
-        启动监控线程
+        启动监控（优先使用文件系统事件，不可用时回退到轮询线程）
 
         Args:
-            check_interval: 检查间隔（秒）
+            check_interval: 轮询模式下的检查间隔（秒）
         """
         if self.running:
             return
 
         self.running = True
+
+        if Observer is not None:
+            # 记录初始修改时间，之后仅在收到文件事件时检查
+            self._check_file()
+            watch_dir = os.path.dirname(os.path.abspath(self.config_file))
+            self.observer = Observer()
+            self.observer.schedule(_ConfigFileEventHandler(self), watch_dir, recursive=False)
+            self.observer.start()
+            logger.info(f"启动配置文件监控: {self.config_file} (文件系统事件)")
+            return
+
         self.thread = threading.Thread(
             target=self._watch_loop, args=(check_interval,), daemon=True
         )
@@ -43,8 +86,12 @@ class ConfigReloader:
         logger.info(f"启动配置文件监控: {self.config_file} (每 {check_interval} 秒检查一次)")
 
     def stop(self):
-        """停止监控线程"""
+        """停止监控"""
         self.running = False
+        if self.observer:
+            self.observer.stop()
+            self.observer.join(timeout=1)
+            self.observer = None
         if self.thread:
             self.thread.join(timeout=1)
         logger.info("配置文件监控已停止")
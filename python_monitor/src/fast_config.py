@@ -0,0 +1,66 @@
+"""
+轻量 INI 解析模块
+只支持本项目配置文件用到的格式：[节]、key = value / key: value、缩进的续行、# 或 ; 开头的整行注释
+"""
+
+import re
+from typing import Dict, List
+
+_SECTION_RE = re.compile(r'^\[([^\]]+)\]')
+_OPTION_RE = re.compile(r'^([^=:\s][^=:]*?)\s*[=:]\s*(.*)$')
+
+
+def parse(path) -> Dict[str, Dict[str, str]]:
+    """
+    单次扫描解析 INI 文件
+
+    与 configparser 默认行为保持一致：键名转为小写、值去除首尾空白；
+    比键名缩进更深的行是上一个值的续行，以换行拼接；节之前的键值对被忽略
+
+    Args:
+        path: 配置文件路径
+
+    Returns:
+        dict: {节: {键: 值}}
+    """
+    sections: Dict[str, Dict[str, List[str]]] = {}
+    current = None
+    lines = None    # 当前值的各行，遇到续行时追加
+    indent = 0      # 当前键所在行的缩进
+
+    # 一次读入整个文件再整体解码，避免文本包装器逐行读取、逐行解码
+    with open(path, 'rb') as f:
+        text = f.read().decode('utf-8-sig')
+
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            # 值中间的空行保留，末尾的空行在拼接后去掉
+            if lines is not None:
+                lines.append('')
+            continue
+        if line[0] in '#;':
+            continue
+
+        line_indent = len(raw) - len(raw.lstrip())
+        if lines is not None and line_indent > indent:
+            lines.append(line)
+            continue
+        indent = line_indent
+
+        match = _SECTION_RE.match(line)
+        if match:
+            current = sections.setdefault(match.group(1), {})
+            lines = None
+            continue
+
+        match = _OPTION_RE.match(line)
+        if match and current is not None:
+            lines = current[match.group(1).lower()] = [match.group(2)]
+        else:
+            lines = None
+
+    return {
+        name: {key: '\n'.join(value).rstrip() for key, value in options.items()}
+        for name, options in sections.items()
+    }
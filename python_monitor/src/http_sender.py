@@ -3,12 +3,52 @@ HTTP 发送模块
 用于将消息发送到 Rust 处理服务
 """
 
-import json
+import asyncio
+import random
 import time
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Union
+import aiohttp
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from loguru import logger
 
+from src.models import TelegramMessage
+
+# 消息体由 orjson 预先序列化为 bytes，需显式声明类型
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+
+def _preview(text: str, limit: int) -> str:
+    """截取响应内容用于日志显示"""
+    return f"{text[:limit]}{'...' if len(text) > limit else ''}"
+
+
+def _backoff_delay(attempt: int) -> float:
+    """指数退避等待时间，叠加随机抖动避免多个请求同时重试"""
+    return 2 ** attempt + random.uniform(0, 0.5)
+
+
+@lru_cache(maxsize=None)
+def _shared_session() -> requests.Session:
+    """进程内共享的同步 HTTP 会话，所有发送器复用同一个连接池"""
+    session = requests.Session()
+    session.headers['User-Agent'] = 'TelegramMonitor/1.0'
+
+    # 连接池复用 keep-alive 连接；重试由 send_message 自行控制
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    # 配置代理：绕过 localhost 和 127.0.0.1
+    session.trust_env = False
+    session.proxies = {
+        'http': None,
+        'https': None,
+    }
+    return session
+
 
 class HttpSender:
     """HTTP 发送器，将消息发送到 Rust 服务"""
@@ -22,89 +62,139 @@ class HttpSender:
                 - url: Rust 服务地址
                 - max_retries: 最大重试次数
                 - timeout: 超时时间（秒）
+                - batch_url: 批量接收地址（可选，默认与 url 同目录的 /messages）
+                - breaker_threshold: 连续失败多少次后熔断（可选，默认 5）
+                - breaker_cooldown: 熔断持续时间（秒，可选，默认 30）
+                - rate_limit: 异步发送每秒最多发起的请求数（可选，默认 0 不限速）
         """
         self.url = config['url']
+        self.batch_url = config.get('batch_url') or f"{self.url.rsplit('/', 1)[0]}/messages"
         self.max_retries = config.get('max_retries', 3)
         self.timeout = config.get('timeout', 30)
-        self.session = requests.Session()
+        self.session = _shared_session()
+
+        # 熔断：连续多次发送失败后，冷却期内直接判定失败，不再请求不可达的服务
+        self.breaker_threshold = config.get('breaker_threshold', 5)
+        self.breaker_cooldown = config.get('breaker_cooldown', 30)
+        self._failure_count = 0
+        self._breaker_open_until = 0.0
 
-        # 配置代理：绕过 localhost 和 127.0.0.1
-        self.session.trust_env = False
-        self.session.proxies = {
-            'http': None,
-            'https': None,
-        }
+        # 异步请求按固定间隔放行，突发的并发发送被平滑到 rate_limit 次/秒
+        rate_limit = config.get('rate_limit', 0)
+        self._min_interval = 1.0 / rate_limit if rate_limit > 0 else 0.0
+        self._next_send_at = 0.0
+
+        # aiohttp 会话需绑定到运行中的事件循环，首次异步发送时再创建
+        self._aio_session: Optional[aiohttp.ClientSession] = None
+        self._batch_supported = True
 
         logger.info(f"HTTP 发送器初始化完成: {self.url}")
 
-    def send_message(self, message_data: Dict) -> bool:
+    def breaker_remaining(self) -> float:
+        """熔断剩余冷却时间（秒），未熔断时为 0"""
+        return max(0.0, self._breaker_open_until - time.monotonic())
+
+    def _record_success(self):
+        """发送成功，清零连续失败计数"""
+        self._failure_count = 0
+
+    def _record_failure(self):
+        """
+        记录一次发送失败，达到阈值后打开熔断
+
+        冷却期结束后计数不清零，下一次失败会立即再次熔断，直到有一次发送成功
+        """
+        self._failure_count += 1
+        if self._failure_count >= self.breaker_threshold:
+            self._breaker_open_until = time.monotonic() + self.breaker_cooldown
+            logger.error(f"✗ 连续 {self._failure_count} 次发送失败，熔断 {self.breaker_cooldown} 秒")
+
+    def send_message(self, message_data: Union[Dict, TelegramMessage]) -> bool:
         """
         发送消息到 Rust 服务
 
         Args:
-            message_data: 消息数据字典
+            message_data: 消息数据字典或 TelegramMessage
 
         Returns:
-            bool: 是否发送成功
+            bool: 是否发送成功（熔断中不发送，直接返回 False）
+
+        只有超时、连接错误和 5xx 会重试并计入熔断；4xx 是请求本身的问题，直接返回 False
         """
+        if isinstance(message_data, TelegramMessage):
+            message_data = message_data.to_dict()
+
         # ✅ 添加详细发送日志
         logger.info(f"📤 HTTP 发送消息:")
         logger.info(f"  URL: {self.url}")
         logger.info(f"  频道: {message_data.get('channel_name', 'Unknown')}")
         logger.info(f"  消息ID: {message_data.get('message_id', 'Unknown')}")
-        logger.debug(f"  完整数据: {json.dumps(message_data, ensure_ascii=False, indent=2)}")
+        logger.opt(lazy=True).debug(
+            "  完整数据: {}",
+            lambda: orjson.dumps(message_data, option=orjson.OPT_INDENT_2).decode(),
+        )
+
+        # 请求体只序列化一次，重试时复用
+        body = orjson.dumps(message_data)
 
         for attempt in range(self.max_retries + 1):
+            # 每次尝试前都检查熔断，重试等待期间其他发送可能已将其打开
+            if self.breaker_remaining():
+                logger.warning("✗ 熔断中，跳过发送")
+                return False
+
             try:
                 if attempt > 0:
                     logger.info(f"🔄 第 {attempt + 1}/{self.max_retries + 1} 次重试...")
 
-                logger.debug(f"发送 HTTP 请求 (尝试 {attempt + 1}/{self.max_retries + 1})")
+                logger.debug("发送 HTTP 请求 (尝试 {}/{})", attempt + 1, self.max_retries + 1)
 
                 response = self.session.post(
                     self.url,
-                    json=message_data,
+                    data=body,
                     timeout=self.timeout,
-                    headers={
-                        'Content-Type': 'application/json',
-                        'User-Agent': 'TelegramMonitor/1.0'
-                    }
+                    headers=JSON_HEADERS,
                 )
 
                 logger.info(f"  响应状态: HTTP {response.status_code}")
-                logger.debug(f"  响应内容: {response.text[:200]}{'...' if len(response.text) > 200 else ''}")
+                logger.opt(lazy=True).debug("  响应内容: {}", lambda: _preview(response.text, 200))
 
                 if response.status_code == 200:
-                    result = response.json()
+                    result = orjson.loads(response.content)
                     if result.get('success'):
+                        self._record_success()
                         logger.info(f"✓ 消息发送成功: {message_data['channel_name']} - {message_data['message_id']}")
                         return True
                     else:
                         logger.error(f"✗ 服务返回错误: {result.get('message', '未知错误')}")
                         return False
+                elif response.status_code < 500:
+                    # 4xx：重试也不会成功，不计入熔断
+                    logger.error(f"✗ HTTP 错误 {response.status_code}: {_preview(response.text, 100)}")
+                    return False
                 else:
-                    logger.error(f"✗ HTTP 错误 {response.status_code}: {response.text[:100]}{'...' if len(response.text) > 100 else ''}")
+                    logger.error(f"✗ HTTP 错误 {response.status_code}: {_preview(response.text, 100)}")
 
                     # 如果不是最后一次尝试，等待后重试
                     if attempt < self.max_retries:
-                        wait_time = 2 ** attempt  # 指数退避
-                        logger.info(f"⏱️  等待 {wait_time} 秒后重试...")
+                        wait_time = _backoff_delay(attempt)
+                        logger.info(f"⏱️  等待 {wait_time:.1f} 秒后重试...")
                         time.sleep(wait_time)
 
             except requests.exceptions.Timeout:
                 logger.error(f"✗ 请求超时 (尝试 {attempt + 1}/{self.max_retries + 1})")
 
                 if attempt < self.max_retries:
-                    wait_time = 2 ** attempt
-                    logger.info(f"等待 {wait_time} 秒后重试...")
+                    wait_time = _backoff_delay(attempt)
+                    logger.info(f"等待 {wait_time:.1f} 秒后重试...")
                     time.sleep(wait_time)
 
             except requests.exceptions.ConnectionError as e:
                 logger.error(f"✗ 连接错误: {e} (尝试 {attempt + 1}/{self.max_retries + 1})")
 
                 if attempt < self.max_retries:
-                    wait_time = 2 ** attempt
-                    logger.info(f"等待 {wait_time} 秒后重试...")
+                    wait_time = _backoff_delay(attempt)
+                    logger.info(f"等待 {wait_time:.1f} 秒后重试...")
                     time.sleep(wait_time)
 
             except Exception as e:
@@ -112,8 +202,205 @@ class HttpSender:
                 return False
 
         logger.error(f"✗ 发送失败 after {self.max_retries + 1} 次尝试")
+        self._record_failure()
         return False
 
+    async def _get_aio_session(self) -> aiohttp.ClientSession:
+        """获取（必要时创建）绑定到当前事件循环的 aiohttp 会话"""
+        if self._aio_session is None or self._aio_session.closed:
+            self._aio_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=32,
+                    limit_per_host=32,
+                    keepalive_timeout=75,  # 保持空闲连接，避免每条消息重新握手
+                    ttl_dns_cache=300,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'User-Agent': 'TelegramMonitor/1.0'},
+                trust_env=False,  # 与同步会话一致：绕过系统代理
+            )
+        return self._aio_session
+
+    async def _throttle(self):
+        """按 rate_limit 等待到下一个可发送时间点"""
+        if not self._min_interval:
+            return
+        now = asyncio.get_running_loop().time()
+        # 先占用时间点再等待，同一事件循环内的并发调用依次排开
+        send_at = max(now, self._next_send_at)
+        self._next_send_at = send_at + self._min_interval
+        if send_at > now:
+            await asyncio.sleep(send_at - now)
+
+    async def send_message_async(
+        self, message_data: Union[Dict, TelegramMessage], max_retries: Optional[int] = None
+    ) -> Optional[bool]:
+        """
+        异步发送消息到 Rust 服务（在事件循环内完成，不占用线程池）
+
+        Args:
+            message_data: 消息数据字典或 TelegramMessage
+            max_retries: 本次发送的最大重试次数，默认使用配置的 max_retries
+
+        Returns:
+            bool: 是否发送成功；熔断中未发送时返回 None，调用方可在熔断结束后重发
+
+        只有超时、连接错误和 5xx 会重试并计入熔断；4xx 是请求本身的问题，直接返回 False
+        """
+        if isinstance(message_data, TelegramMessage):
+            message_data = message_data.to_dict()
+
+        logger.debug("📤 HTTP 发送消息:")
+        logger.debug("  URL: {}", self.url)
+        logger.debug("  频道: {}", message_data.get('channel_name', 'Unknown'))
+        logger.debug("  消息ID: {}", message_data.get('message_id', 'Unknown'))
+        logger.opt(lazy=True).debug(
+            "  完整数据: {}",
+            lambda: orjson.dumps(message_data, option=orjson.OPT_INDENT_2).decode(),
+        )
+
+        if max_retries is None:
+            max_retries = self.max_retries
+
+        session = await self._get_aio_session()
+        # 请求体只序列化一次，重试时复用
+        payload = orjson.dumps(message_data)
+
+        for attempt in range(max_retries + 1):
+            # 每次尝试前都检查熔断，重试等待期间其他并发发送可能已将其打开
+            if self.breaker_remaining():
+                logger.debug("✗ 熔断中，跳过发送")
+                return None
+
+            try:
+                if attempt > 0:
+                    logger.info(f"🔄 第 {attempt + 1}/{max_retries + 1} 次重试...")
+
+                logger.debug("发送 HTTP 请求 (尝试 {}/{})", attempt + 1, max_retries + 1)
+
+                await self._throttle()
+                async with session.post(
+                    self.url, data=payload, headers=JSON_HEADERS
+                ) as response:
+                    status = response.status
+                    # 读取原始字节交给 orjson 解析，只有需要显示时才解码为文本
+                    body = await response.read()
+
+                logger.debug("  响应状态: HTTP {}", status)
+                logger.opt(lazy=True).debug("  响应内容: {}", lambda: _preview(body.decode(errors='replace'), 200))
+
+                if status == 200:
+                    result = orjson.loads(body)
+                    if result.get('success'):
+                        self._record_success()
+                        logger.debug("✓ 消息发送成功: {} - {}", message_data['channel_name'], message_data['message_id'])
+                        return True
+                    else:
+                        logger.error(f"✗ 服务返回错误: {result.get('message', '未知错误')}")
+                        return False
+                elif status < 500:
+                    # 4xx：重试也不会成功，不计入熔断
+                    logger.error(f"✗ HTTP 错误 {status}: {_preview(body.decode(errors='replace'), 100)}")
+                    return False
+                else:
+                    logger.error(f"✗ HTTP 错误 {status}: {_preview(body.decode(errors='replace'), 100)}")
+
+                    if attempt < max_retries:
+                        wait_time = _backoff_delay(attempt)
+                        logger.info(f"⏱️  等待 {wait_time:.1f} 秒后重试...")
+                        await asyncio.sleep(wait_time)
+
+            except asyncio.TimeoutError:
+                logger.error(f"✗ 请求超时 (尝试 {attempt + 1}/{max_retries + 1})")
+
+                if attempt < max_retries:
+                    wait_time = _backoff_delay(attempt)
+                    logger.info(f"等待 {wait_time:.1f} 秒后重试...")
+                    await asyncio.sleep(wait_time)
+
+            except aiohttp.ClientConnectionError as e:
+                logger.error(f"✗ 连接错误: {e} (尝试 {attempt + 1}/{max_retries + 1})")
+
+                if attempt < max_retries:
+                    wait_time = _backoff_delay(attempt)
+                    logger.info(f"等待 {wait_time:.1f} 秒后重试...")
+                    await asyncio.sleep(wait_time)
+
+            except Exception as e:
+                logger.error(f"✗ 发送消息异常: {type(e).__name__}: {e}")
+                return False
+
+        logger.error(f"✗ 发送失败 after {max_retries + 1} 次尝试")
+        self._record_failure()
+        return False
+
+    async def send_batch_async(
+        self, messages: List[Union[Dict, TelegramMessage]], max_retries: Optional[int] = None
+    ) -> List[Optional[bool]]:
+        """
+        批量发送消息，服务端不支持批量接口（404）时逐条发送
+
+        批量请求的其他失败不拆成逐条重发，整批返回 False，由调用方的重试队列负责重发
+
+        Args:
+            messages: 消息数据字典或 TelegramMessage 列表
+            max_retries: 逐条发送时每条消息的最大重试次数，默认使用配置的 max_retries
+
+        Returns:
+            List[Optional[bool]]: 与 messages 顺序对应的发送结果，熔断中未发送的消息为 None
+        """
+        if self.breaker_remaining():
+            logger.debug("✗ 熔断中，跳过批量发送: {} 条", len(messages))
+            return [None] * len(messages)
+
+        if len(messages) > 1 and self._batch_supported:
+            logger.debug("📤 HTTP 批量发送消息: {} 条 -> {}", len(messages), self.batch_url)
+            session = await self._get_aio_session()
+            try:
+                await self._throttle()
+                async with session.post(
+                    self.batch_url, data=orjson.dumps({'messages': messages}), headers=JSON_HEADERS
+                ) as response:
+                    status = response.status
+                    body = await response.read()
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                # 不改为逐条发送：服务端可能已收到该批，且会把一次失败放大成 N 个请求；重试交给调用方
+                logger.error(f"✗ 批量发送失败: {type(e).__name__}: {e}")
+                self._record_failure()
+                return [False] * len(messages)
+
+            if status == 200:
+                try:
+                    results = (orjson.loads(body).get('data') or {}).get('results')
+                except (orjson.JSONDecodeError, AttributeError):
+                    results = None
+                if isinstance(results, list) and len(results) == len(messages):
+                    self._record_success()
+                    logger.debug("✓ 批量发送完成: {}/{} 条成功", sum(1 for ok in results if ok), len(messages))
+                    return [bool(ok) for ok in results]
+                logger.error(f"✗ 批量接口响应格式异常: {_preview(body.decode(errors='replace'), 100)}")
+                self._record_failure()
+                return [False] * len(messages)
+
+            if status != 404:
+                logger.error(f"✗ 批量发送 HTTP 错误 {status}: {_preview(body.decode(errors='replace'), 100)}")
+                # 与单条发送一致：只有 5xx 计入熔断
+                if status >= 500:
+                    self._record_failure()
+                return [False] * len(messages)
+
+            # 只有 404（服务端没有批量接口）才改为逐条发送
+            logger.warning("Rust 服务不支持批量接口，改为逐条发送")
+            self._batch_supported = False
+
+        return list(await asyncio.gather(*(self.send_message_async(m, max_retries) for m in messages)))
+
+    async def close(self):
+        """关闭异步 HTTP 会话"""
+        if self._aio_session is not None and not self._aio_session.closed:
+            await self._aio_session.close()
+        self._aio_session = None
+
     def health_check(self) -> bool:
         """
         健康检查
@@ -128,11 +415,7 @@ class HttpSender:
 
             logger.debug(f"检查 Rust 服务健康状态: {health_url}")
 
-            response = self.session.get(
-                health_url,
-                timeout=10,
-                headers={'User-Agent': 'TelegramMonitor/1.0'}
-            )
+            response = self.session.get(health_url, timeout=10)
 
             if response.status_code == 200:
                 result = response.json()
@@ -146,3 +429,27 @@ class HttpSender:
         except Exception as e:
             logger.error(f"✗ 健康检查异常: {type(e).__name__}: {e}")
             return False
+
+
+_SENDERS: Dict[tuple, HttpSender] = {}
+
+
+def get_sender(config: Dict) -> HttpSender:
+    """
+    按完整配置复用 HttpSender，避免重复创建发送器
+
+    同一地址但重试、超时、熔断等参数不同的配置会得到各自的发送器，
+    不会拿到按先前配置创建、且带着其熔断状态的实例
+
+    Args:
+        config: 配置字典，同 HttpSender
+
+    Returns:
+        HttpSender: 该配置对应的发送器（首次调用时按 config 创建）
+    """
+    # 值为 None 的键等同于未配置（使用默认值）
+    key = tuple(sorted((k, v) for k, v in config.items() if v is not None))
+    sender = _SENDERS.get(key)
+    if sender is None:
+        sender = _SENDERS[key] = HttpSender(config)
+    return sender
@@ -0,0 +1,27 @@
+"""
+日志初始化模块
+测试脚本共用的控制台日志配置
+"""
+
+import sys
+from loguru import logger
+
+LOG_FORMAT = "<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{message}</cyan>"
+
+_configured = False
+
+
+def setup(level: str = "INFO"):
+    """
+    配置控制台日志输出，同一进程内只生效一次
+
+    Args:
+        level: 日志级别
+    """
+    global _configured
+    if _configured:
+        return
+
+    logger.remove()
+    logger.add(sys.stderr, format=LOG_FORMAT, level=level)
+    _configured = True
@@ -0,0 +1,27 @@
+"""
+消息数据模型
+发送到 Rust 服务的消息格式
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+@dataclass(frozen=True)
+class TelegramMessage:
+    """发送到 Rust 服务的一条频道消息"""
+
+    # 手动声明 __slots__（dataclass 的 slots 参数需要 Python 3.10）；
+    # 带槽的字段不能有类级默认值，因此 sender 需显式传入
+    __slots__ = ('channel_id', 'channel_name', 'message_id', 'text', 'timestamp', 'sender')
+
+    channel_id: int
+    channel_name: str
+    message_id: int
+    text: str
+    timestamp: int
+    sender: Optional[str]
+
+    def to_dict(self) -> Dict:
+        """转换为请求体字典（按字段直接取值，不做 dataclasses.asdict 的递归拷贝）"""
+        return {name: getattr(self, name) for name in self.__slots__}
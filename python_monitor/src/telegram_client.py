@@ -3,22 +3,143 @@ Telegram 监控模块 - 使用 debug_monitor.py 验证成功的架构
 使用 Pyrogram 监控频道消息
 """
 
-from typing import Dict, List
+import functools
+import heapq
+import itertools
+import os
+import re
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import ClassVar, Dict, List, Optional, Tuple
 from loguru import logger
 from pyrogram import Client, filters
+from pyrogram.enums import ChatType
 from pyrogram.types import Message
 from pyrogram.handlers import MessageHandler
 from src.http_sender import HttpSender
+from src.config_loader import load_proxy_from_env
 import asyncio
-import os
 
-# 全局变量防止客户端被垃圾回收
-_global_pyrogram_client = None
-_global_http_sender = None
+# TgCrypto 为 Pyrogram 提供 C 实现的 AES-256-IGE，缺失时会退回极慢的纯 Python 解密
+try:
+    import tgcrypto  # noqa: F401
+except ImportError as e:
+    raise ImportError(
+        "未安装 TgCrypto，Pyrogram 将使用纯 Python 解密 MTProto 数据包。"
+        "请执行: pip install tgcrypto"
+    ) from e
+
+# MONITOR_DEBUG=1 时输出逐条消息的完整诊断信息（与 monitor.py 的 Pyrogram 调试开关一致）
+_LOG_VERBOSE = os.environ.get("MONITOR_DEBUG") == "1"
+
+# uvloop（libuv 实现的事件循环）在 Windows 上不可用，缺失时回退到标准 asyncio
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def _preview(text: str, limit: int) -> str:
+    """截取消息内容用于日志预览（换行转义为 \\n）"""
+    return f"{text[:limit]}{'...' if len(text) > limit else ''}".replace('\n', '\\n')
+
+
+# 媒体标签种类有限（重复出现的文件名、固定的媒体类型），缓存后复用同一个字符串对象
+@functools.lru_cache(maxsize=1024)
+def _document_label(file_name: Optional[str]) -> str:
+    return f"Document: {file_name or 'Unknown'}"
+
+
+@functools.lru_cache(maxsize=1024)
+def _media_placeholder(label: str) -> str:
+    return f"[Media: {label}]"
+
+
+@dataclass
+class MonitorStats:
+    """运行统计（热路径上按属性累加，避免字典下标查找）"""
+    messages_received: int = 0
+    messages_sent: int = 0
+    messages_failed: int = 0
+    messages_dropped: int = 0
+    last_message_time: Optional[datetime] = None
+    # 实际转发过消息的频道/聊天（跳过的消息不计入），按最近活跃排序，最多保留 _ACTIVE_MAX 个
+    channels_active: "OrderedDict[int, None]" = field(default_factory=OrderedDict)
+
+    _ACTIVE_MAX: ClassVar[int] = 4096
+
+    def mark_active(self, chat_id: int):
+        """记录活跃频道/聊天，超出上限时淘汰最久未活跃的"""
+        active = self.channels_active
+        if chat_id in active:
+            active.move_to_end(chat_id)
+            return
+        active[chat_id] = None
+        if len(active) > self._ACTIVE_MAX:
+            active.popitem(last=False)
+
 
 class TelegramMonitor:
     """Telegram 监控器 - 使用验证成功的架构"""
 
+    # 媒体属性 -> 显示名称生成函数（参数为该属性的值），按原 elif 链的顺序检查
+    _MEDIA_ATTRS = (
+        ("photo", lambda _: "Photo"),
+        ("video", lambda _: "Video"),
+        ("audio", lambda _: "Audio"),
+        ("document", lambda doc: _document_label(doc.file_name)),
+        ("sticker", lambda _: "Sticker"),
+        ("animation", lambda _: "Animation"),
+        ("voice", lambda _: "Voice"),
+        ("video_note", lambda _: "Video Note"),
+        ("poll", lambda _: "Poll"),
+    )
+
+    # 聊天类型 -> 处理类型（Pyrogram 返回 ChatType 枚举而非字符串）；不在表中的类型不处理
+    _TYPE_MAP = {
+        ChatType.BOT: "bot",
+        ChatType.PRIVATE: "private",
+        ChatType.GROUP: "group",
+        ChatType.SUPERGROUP: "group",
+    }
+
+    # Pump Alert 关键词与来源标识（预编译，单次扫描且无需 upper() 复制整段文本）
+    _PUMP_RE = re.compile(r'PUMP', re.IGNORECASE)
+    _PUMP_OR_ALERT_RE = re.compile(r'PUMP|ALERT', re.IGNORECASE)
+    _PUMP_ALERT_SOURCE_RE = re.compile(r'-1002115686230|Pump Alert')
+
+    # 转发文本的最大长度及截断后缀
+    _MAX_TEXT_LEN = 4000
+    _TRUNC_SUFFIX = '... [截断]'
+
+    # 发送队列容量；后台任务每批最多发送 _BATCH_MAX_SIZE 条，或等待 _BATCH_LINGER 秒后发出
+    _QUEUE_MAX_SIZE = 10000
+    _BATCH_MAX_SIZE = 50
+    _BATCH_LINGER = 0.05
+
+    # 同时在途的发送批次上限
+    _MAX_IN_FLIGHT = 4
+
+    # 重试队列容量、最大重试次数与首次重试延迟（秒，按 2 的幂递增）
+    _RETRY_QUEUE_SIZE = 1000
+    _RETRY_MAX_ATTEMPTS = 3
+    _RETRY_BASE_DELAY = 2.0
+
+    # 停止时等待发送队列与在途批次发完的最长时间（秒），超时后取消剩余发送
+    _SHUTDOWN_DRAIN_TIMEOUT = 10.0
+
+    # 实时统计的输出间隔：每 _STATS_LOG_EVERY 条消息或每 _STATS_LOG_INTERVAL 秒至多一次
+    _STATS_LOG_EVERY = 100
+    _STATS_LOG_INTERVAL = 60.0
+
+    # 去重缓存保留的最近消息数
+    _SEEN_MAX = 2000
+
+    # 记录过完整堆栈的异常种类上限
+    _MAX_LOGGED_EXCS = 100
+
     def __init__(self, api_id: int, api_hash: str, session_file: str, channel_ids: List[int], http_sender: HttpSender):
         """
         初始化 - 使用与 debug_monitor.py 相同的简单架构
@@ -34,25 +155,32 @@ class TelegramMonitor:
         self.api_hash = api_hash
         self.session_file = session_file
         self.channel_ids = channel_ids
+        # 消息处理热路径使用的 O(1) 成员检查集合，需与 channel_ids 保持同步
+        self._channel_id_set = set(channel_ids)
         self.http_sender = http_sender
+        self.client = None
 
-        # 保存到全局变量防止垃圾回收
-        global _global_http_sender
-        _global_http_sender = http_sender
+        # 事件循环与停止信号（在 start_async 中创建）
+        self._loop = None
+        self._stop_event = None
 
         # ✅ 初始化统计（简化版）
-        self.stats = {
-            'messages_received': 0,
-            'messages_sent': 0,
-            'messages_failed': 0,
-            'last_message_time': None,
-            'channels_active': set()
-        }
+        self.stats = MonitorStats()
+        self._stats_log_next = self._STATS_LOG_EVERY
+        self._stats_logged_at = time.monotonic()
+
+        # 最近处理过的 (chat_id, message_id)，用于去重
+        self._seen = OrderedDict()
+
+        # 已输出过完整堆栈的异常 (类型, 消息)，按先进先出淘汰
+        self._logged_excs = set()
+        self._logged_excs_order = deque()
 
         logger.info(f"Telegram 监控器初始化完成")
         logger.info(f"  API ID: {api_id}")
         logger.info(f"  会话文件: {session_file}")
         logger.info(f"  监控频道: {len(channel_ids)} 个")
+        logger.info("  加密后端: TgCrypto (AES-NI 加速)")
 
     async def start_async(self):
         """异步启动监控 - 使用 debug_monitor.py 的成功模式"""
@@ -60,289 +188,51 @@ class TelegramMonitor:
         logger.info("Telegram 监控器启动中...")
         logger.info("========================================")
 
+        # 待发送消息队列（需在事件循环内创建）
+        self._queue = asyncio.Queue(maxsize=self._QUEUE_MAX_SIZE)
+        self._worker = None
+        # 发送失败的消息按重试时间排成小顶堆：(重试时间, 序号, 已重试次数, 消息数据)
+        # 有新消息入堆时置位 _retry_added，唤醒正在等待堆顶到期的重试任务
+        self._retry_heap = []
+        self._retry_added = asyncio.Event()
+        self._retry_seq = itertools.count()
+        self._retry_worker = None
+        self._send_slots = asyncio.Semaphore(self._MAX_IN_FLIGHT)
+        self._send_tasks = set()
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+
         try:
             # 步骤 1: 连接 Telegram（简化流程）
             logger.info("步骤 1/3: 连接 Telegram...")
 
             # 检查代理设置
-            proxy = None
-            http_proxy = os.environ.get('http_proxy') or os.environ.get('HTTP_PROXY')
-            if http_proxy:
-                logger.info(f"检测到代理设置: {http_proxy}")
-                if http_proxy.startswith('http://'):
-                    proxy_url = http_proxy[7:]
-                    if ':' in proxy_url:
-                        hostname, port = proxy_url.split(':')
-                        proxy = {
-                            "scheme": "http",
-                            "hostname": hostname,
-                            "port": int(port)
-                        }
-                        logger.info(f"配置代理: {proxy}")
-
-            # 关键：使用全局变量存储客户端引用
-            global _global_pyrogram_client
-
-            # 创建 Pyrogram 客户端（与 debug_monitor.py 相同的方式）
-            _global_pyrogram_client = Client(
+            proxy = load_proxy_from_env()
+            if proxy:
+                logger.info(f"配置代理: {proxy['scheme']}://{proxy['hostname']}:{proxy['port']}")
+
+            # 创建 Pyrogram 客户端（与 debug_monitor.py 相同的方式）；
+            # 由实例持有引用即可，调用方持有 TelegramMonitor 实例
+            self.client = Client(
                 self.session_file,
                 api_id=self.api_id,
                 api_hash=self.api_hash,
                 proxy=proxy
             )
 
-            # 同时保存到实例属性
-            self.client = _global_pyrogram_client
-
             # 步骤 2: 注册消息处理器（将在客户端启动后验证频道）
             logger.info("步骤 2/3: 注册消息处理器...")
 
-            @self.client.on_message()
-            async def message_handler(client, message):
-                """
-                全局消息捕获和分析处理器
-                - 捕获所有消息
-                - 分析消息类型和来源
-                - 只处理我们关心的消息（频道和 Bot）
-                """
-                # ==================== 全局消息捕获 ====================
-                logger.info("🎯【全局捕获】收到新消息！")
-                logger.info(f"  📍 聊天ID: {message.chat.id}")
-                logger.info(f"  📍 消息ID: {message.id}")
-                logger.info(f"  📍 聊天类型: {message.chat.type}")
-                logger.info(f"  📍 聊天标题: {getattr(message.chat, 'title', 'N/A')}")
-
-                # 显示发送者信息
-                if message.from_user:
-                    sender = message.from_user
-                    sender_name = sender.username or sender.first_name or 'Unknown'
-                    logger.info(f"  👤 发送者用户: {sender_name} ({sender.id})")
-                elif message.sender_chat:
-                    sender = message.sender_chat
-                    sender_name = getattr(sender, 'title', 'Unknown')
-                    logger.info(f"  📢 发送者频道: {sender_name} ({sender.id})")
-
-                # 显示消息内容预览
-                if message.text:
-                    preview = message.text[:200].replace('\n', '\\n')
-                    logger.info(f"  📝 内容预览: {preview}{'...' if len(message.text) > 200 else ''}")
-                elif message.caption:
-                    preview = message.caption[:200].replace('\n', '\\n')
-                    logger.info(f"  🖼️  媒体描述: {preview}{'...' if len(message.caption) > 200 else ''}")
-
-                # ==================== 消息类型分析 ====================
-                logger.info("🔬【消息分析】开始分析消息类型...")
-
-                # 分析1: 是否在监控的频道列表中
-                if message.chat.id in self.channel_ids:
-                    logger.info(f"  ✅【频道消息】这是监控的频道消息！")
-                    message_type = "channel"
-                # 分析2: 是否为 Bot 消息
-                elif message.chat.type == "bot":
-                    logger.info(f"  🤖【Bot消息】这是 Bot 消息，检查是否包含 Pump Alert...")
-                    message_type = "bot"
-                # 分析3: 是否为私聊
-                elif message.chat.type == "private":
-                    logger.info(f"  💬【私聊消息】这是私人聊天消息")
-                    message_type = "private"
-                # 分析4: 是否为群组/超级群组
-                elif message.chat.type in ["group", "supergroup"]:
-                    logger.info(f"  👥【群组消息】这是群组消息")
-                    message_type = "group"
-                else:
-                    logger.info(f"  ❓【未知类型】未识别的聊天类型: {message.chat.type}")
-                    message_type = "unknown"
-
-                # ==================== 智能过滤和处理 ====================
-                logger.info("🤖【智能处理】根据消息类型决定是否处理...")
-
-                # 处理我们关心的消息类型：频道消息、Bot 消息、群组消息和私聊消息
-                if message_type in ["channel", "bot", "group", "private"]:
-                    logger.info(f"  ✅【处理决定】处理此消息 (类型: {message_type})")
-
-                    # 特殊处理：群组和私聊消息，检查是否包含 Pump Alert 信息
-                    if message_type in ["group", "private"] and message.text:
-                        logger.info("🔍【非频道消息检查】检查是否包含 Pump/Alert 关键词...")
-                        if "PUMP" in message.text.upper() or "ALERT" in message.text.upper():
-                            logger.info("🎯【特殊消息】群组/私聊消息包含 Pump/Alert 关键词！")
-                            # 继续处理，可能包含重要信息
-
-                    # 特殊调试：针对 Pump Alert 频道和 Bot 消息的详细日志
-                    if message.chat.id == -1002115686230:
-                        logger.info("🚨【特殊频道】收到 PUMP ALERT 频道消息！")
-
-                    # Bot 消息特殊处理：检查是否包含 Pump Alert 信息
-                    if message_type == "bot" and message.text and "PUMP" in message.text.upper():
-                        logger.info("🎯【Bot关键词】Bot消息包含 PUMP 关键词！")
-
-                        # 检查是否包含 Pump Alert 频道信息
-                        if "-1002115686230" in message.text or "Pump Alert" in message.text:
-                            logger.info("🎯【确认PumpAlert】这是 Pump Alert 的 Bot 转发消息！")
-                            # 将 Bot 消息视为 Pump Alert 频道消息进行处理
-                            pump_alert_data = {
-                                'channel_id': -1002115686230,
-                                'channel_name': 'Pump Alert - GMGN',
-                                'message_id': message.id,
-                                'text': message.text,
-                                'timestamp': int(message.date.timestamp()),
-                                'sender': f"Bot_{message.chat.id}",
-                                'is_bot_forward': True
-                            }
-                            # 使用 Pump Alert 频道ID进行后续处理
-                            effective_channel_id = -1002115686230
-                        else:
-                            # 其他 Bot 消息，使用 Bot ID
-                            effective_channel_id = message.chat.id
-                    else:
-                        # 正常频道消息
-                        effective_channel_id = message.chat.id
-
-                    # ✅ 更新统计
-                    self.stats['messages_received'] += 1
-                    self.stats['last_message_time'] = message.date
-                    self.stats['channels_active'].add(effective_channel_id)
-
-                    try:
-                        # 提取消息信息
-                        channel_name = getattr(message.chat, 'title', 'Unknown')
-                        logger.info(f"📨【消息详情】正在处理:")
-                        logger.info(f"  📍 频道: {channel_name} ({effective_channel_id})")
-                        logger.info(f"  📝 消息ID: {message.id}")
-                        logger.info(f"  ⏰ 时间: {message.date.strftime('%Y-%m-%d %H:%M:%S')}")
-
-                        # 提取并发送消息数据
-                        if message_type == "bot" and "-1002115686230" in message.text:
-                            # 使用 Pump Alert 数据
-                            message_data = pump_alert_data
-                        else:
-                            # 正常提取消息数据
-                            message_data = self.extract_message_data(message)
-
-                        # 发送到 Rust 服务
-                        logger.info(f"⬆️【转发到Rust】发送到处理服务...")
-                        success = await asyncio.to_thread(self.http_sender.send_message, message_data)
-
-                        # 更新统计
-                        if success:
-                            self.stats['messages_sent'] += 1
-                            logger.info(f"✓ 消息处理完成: {message_data['message_id']}")
-                        else:
-                            self.stats['messages_failed'] += 1
-                            logger.warning(f"⚠️  消息发送失败: {message_data['message_id']}")
-
-                        # 显示统计
-                        logger.info(f"📊 实时统计:")
-                        logger.info(f"  累计接收: {self.stats['messages_received']}")
-                        logger.info(f"  成功发送: {self.stats['messages_sent']}")
-                        logger.info(f"  发送失败: {self.stats['messages_failed']}")
-                        logger.info(f"  活跃频道: {len(self.stats['channels_active'])}")
-
-                    except Exception as e:
-                        self.stats['messages_failed'] += 1
-                        logger.error(f"处理消息时出错: {e}")
-                        logger.exception(e)
-
-                else:
-                    logger.info(f"  ⏭️【跳过处理】不处理此消息 (类型: {message_type})")
-                    # 只记录接收统计，不处理消息
-                    self.stats['messages_received'] += 1
-                    self.stats['last_message_time'] = message.date
-                    self.stats['channels_active'].add(message.chat.id)
-                    return  # 直接返回，不继续处理
-
-                # ==================== 消息处理 ====================
-
-                # 只有在处理的消息才执行这部分
-                try:
-                    # 确定有效频道/聊天ID和名称
-                    if message_type == "bot" and message.text and ("-1002115686230" in message.text or "Pump Alert" in message.text):
-                        # Bot转发的Pump Alert消息映射到实际频道
-                        effective_channel_id = -1002115686230
-                        effective_channel_name = "Pump Alert - GMGN"
-                    elif message_type == "group":
-                        # 群组消息
-                        effective_channel_id = message.chat.id
-                        effective_channel_name = getattr(message.chat, 'title', f'Group_{message.chat.id}')
-                    elif message_type == "private":
-                        # 私聊消息
-                        effective_channel_id = message.chat.id
-                        sender_name = getattr(message.from_user, 'username', 'Unknown') if message.from_user else 'Unknown'
-                        effective_channel_name = f"Private_{sender_name}"
-                    else:
-                        # 正常频道消息
-                        effective_channel_id = message.chat.id
-                        effective_channel_name = getattr(message.chat, 'title', 'Unknown')
-
-                    # 记录活跃频道/聊天
-                    self.stats['channels_active'].add(effective_channel_id)
-
-                    # 提取消息信息
-                    logger.info(f"📨 收到新消息:")
-                    logger.info(f"  来源: {effective_channel_name} ({effective_channel_id})")
-                    logger.info(f"  消息ID: {message.id}")
-                    logger.info(f"  时间: {message.date.strftime('%Y-%m-%d %H:%M:%S')}")
-
-                    # 显示发送者信息
-                    if message.from_user:
-                        sender = message.from_user
-                        sender_name = sender.username or sender.first_name or 'Unknown'
-                        logger.info(f"  发送者: {sender_name} ({sender.id})")
-                    elif message.sender_chat:
-                        sender_chat = message.sender_chat
-                        sender_name = getattr(sender_chat, 'title', 'Unknown')
-                        logger.info(f"  发送者: {sender_name} (频道)")
-
-                    # 显示消息内容预览
-                    if message.text:
-                        preview = message.text[:100].replace('\n', '\\n')
-                        logger.info(f"  内容: {preview}{'...' if len(message.text) > 100 else ''}")
-                    elif message.caption:
-                        preview = message.caption[:100].replace('\n', '\\n')
-                        logger.info(f"  媒体描述: {preview}{'...' if len(message.caption) > 100 else ''}")
-                    else:
-                        media_type = self.get_media_type(message)
-                        logger.info(f"  媒体类型: {media_type}")
-
-                    # 提取消息数据（特殊处理 Bot 消息）
-                    if message_type == "bot" and message.text and ("-1002115686230" in message.text or "Pump Alert" in message.text):
-                        # 使用 Pump Alert 数据
-                        message_data = {
-                            'channel_id': -1002115686230,
-                            'channel_name': 'Pump Alert - GMGN',
-                            'message_id': message.id,
-                            'text': message.text,
-                            'timestamp': int(message.date.timestamp()),
-                            'sender': f"Bot_{message.chat.id}",
-                            'is_bot_forward': True
-                        }
-                    else:
-                        # 正常提取消息数据
-                        message_data = self.extract_message_data(message)
-
-                    # 发送到 Rust 服务
-                    logger.info(f"⬆️  转发到 Rust 服务...")
-                    success = await asyncio.to_thread(self.http_sender.send_message, message_data)
-
-                    # 更新统计
-                    if success:
-                        self.stats['messages_sent'] += 1
-                        logger.info(f"✓ 消息处理完成: {message_data['message_id']}")
-                    else:
-                        self.stats['messages_failed'] += 1
-                        logger.warning(f"⚠️  消息发送失败: {message_data['message_id']}")
-
-                    # 显示统计
-                    logger.info(f"📊 实时统计:")
-                    logger.info(f"  累计接收: {self.stats['messages_received']}")
-                    logger.info(f"  成功发送: {self.stats['messages_sent']}")
-                    logger.info(f"  发送失败: {self.stats['messages_failed']}")
-                    logger.info(f"  活跃频道: {len(self.stats['channels_active'])}")
-
-                except Exception as e:
-                    self.stats['messages_failed'] += 1
-                    logger.error(f"处理消息时出错: {e}")
-                    logger.exception(e)
+            # 未监控频道的消息在 Pyrogram 分发阶段直接丢弃，不再为其调度处理协程；
+            # 过滤器在调用时读取 _channel_id_set，频道列表热更新后无需重新注册
+            monitored_filter = filters.create(
+                lambda _, __, m: m.chat is not None and (
+                    m.chat.id in self._channel_id_set or m.chat.type is not ChatType.CHANNEL
+                ),
+                name="MonitoredChatFilter",
+            )
 
+            self.client.add_handler(MessageHandler(self._on_message, monitored_filter))
             logger.info("✓ 消息处理器注册成功")
 
             # 步骤 3: 启动客户端、验证频道并开始监听
@@ -352,6 +242,10 @@ class TelegramMonitor:
             await self.client.start()
             logger.info("✓ Telegram 监控器启动成功！")
 
+            # 启动后台发送与重试任务
+            self._worker = asyncio.create_task(self._drain_loop())
+            self._retry_worker = asyncio.create_task(self._retry_loop())
+
             # 验证频道访问权限（需要在客户端启动后进行）
             logger.info("验证频道访问权限...")
             verified_channels, failed_channels = await self.verify_channels()
@@ -364,37 +258,48 @@ class TelegramMonitor:
             logger.info("等待新消息... 按 Ctrl+C 停止")
             logger.info("========================================")
 
-            # 保持运行 - 使用与 debug_monitor.py 相同的简单等待方式
-            self._running = True
-            while self._running:
-                await asyncio.sleep(1)
+            # 保持运行，直到 stop()/stop_async() 发出停止信号
+            await self._stop_event.wait()
 
         except asyncio.CancelledError:
             logger.info("\n收到停止信号，正在关闭...")
             return True
         except Exception as e:
-            logger.error(f"启动失败: {type(e).__name__}: {e}")
-            logger.exception(e)
+            logger.opt(exception=e).error("启动失败: {}: {}", type(e).__name__, e)
             return False
         finally:
-            self._running = False
+            self._stop_event.set()
+            if self._worker is not None:
+                try:
+                    await asyncio.wait_for(self._flush_pending(), self._SHUTDOWN_DRAIN_TIMEOUT)
+                except asyncio.TimeoutError:
+                    logger.warning(f"等待消息发送超时（{self._SHUTDOWN_DRAIN_TIMEOUT} 秒），取消剩余发送")
+            tasks = [t for t in (self._worker, self._retry_worker, *self._send_tasks) if t is not None]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._worker = self._retry_worker = None
+            pending = self._queue.qsize() + len(self._retry_heap)
+            if pending:
+                logger.warning(f"退出时仍有 {pending} 条消息未发送")
+            await self.stop_async()
 
     def start(self):
         """启动监控（入口方法）"""
+        if uvloop is not None:
+            uvloop.install()
+            logger.info("事件循环: uvloop")
         try:
             asyncio.run(self.start_async())
         except KeyboardInterrupt:
             logger.info("\n用户中断，程序退出")
         except Exception as e:
-            logger.error(f"运行错误: {type(e).__name__}: {e}")
-            logger.exception(e)
+            logger.opt(exception=e).error("运行错误: {}: {}", type(e).__name__, e)
 
     def stop(self):
-        """停止监控"""
-        self._running = False
-        if self.client and self.client.is_connected:
-            asyncio.create_task(self.client.stop())
-            logger.info("Telegram 客户端已断开连接")
+        """停止监控（可在任意线程调用，客户端由 start_async 退出时断开）"""
+        if self._loop is not None and self._stop_event is not None:
+            self._loop.call_soon_threadsafe(self._stop_event.set)
 
     def get_channel_ids(self):
         """获取当前频道ID列表"""
@@ -403,29 +308,309 @@ class TelegramMonitor:
     def set_channel_ids(self, channel_ids):
         """设置新的频道ID列表"""
         old_count = len(self.channel_ids)
-        self.channel_ids = channel_ids.copy()
+        self.channel_ids = list(channel_ids)
+        self._channel_id_set = set(self.channel_ids)
         new_count = len(self.channel_ids)
         logger.info(f"频道列表已更新: {old_count} -> {new_count} 个频道")
 
     def add_channel(self, channel_id):
         """添加单个频道"""
-        if channel_id not in self.channel_ids:
+        if channel_id not in self._channel_id_set:
             self.channel_ids.append(channel_id)
+            self._channel_id_set.add(channel_id)
             logger.info(f"添加监控频道: {channel_id}")
             return True
         return False
 
     def remove_channel(self, channel_id):
         """删除频道"""
-        if channel_id in self.channel_ids:
+        if channel_id in self._channel_id_set:
             self.channel_ids.remove(channel_id)
+            self._channel_id_set.discard(channel_id)
             logger.info(f"删除监控频道: {channel_id}")
             return True
         return False
 
     def is_channel_monitored(self, channel_id):
         """检查频道是否在监控列表中"""
-        return channel_id in self.channel_ids
+        return channel_id in self._channel_id_set
+
+    async def _on_message(self, client: Client, message: Message):
+        """
+        全局消息捕获和分析处理器
+        - 捕获所有消息
+        - 分析消息类型和来源
+        - 只处理我们关心的消息（频道和 Bot）
+        """
+        chat = message.chat
+        chat_id = chat.id
+
+        # 丢弃重连/会话恢复后 Pyrogram 重复投递的消息
+        key = (chat_id, message.id)
+        if key in self._seen:
+            self._seen.move_to_end(key)
+            logger.debug("跳过重复消息: {} - {}", *key)
+            return
+        self._seen[key] = None
+        if len(self._seen) > self._SEEN_MAX:
+            self._seen.popitem(last=False)
+
+        # ==================== 消息类型分析 ====================
+        # 只根据聊天 ID 和类型判断，不处理的消息在任何诊断输出和数据提取之前直接返回
+        chat_type = chat.type
+        message_type = "channel" if chat_id in self._channel_id_set else self._TYPE_MAP.get(chat_type)
+        if message_type is None:
+            logger.debug("⏭️【跳过处理】未识别的聊天类型: {} ({})", chat_type, chat_id)
+            # 只记录接收统计，不处理消息
+            self.stats.messages_received += 1
+            self.stats.last_message_time = message.date
+            self._maybe_log_stats()
+            return
+
+        # ==================== 全局消息捕获 ====================
+        # 逐条诊断输出仅在 MONITOR_DEBUG=1 时执行，避免每条消息的属性读取与格式化
+        if _LOG_VERBOSE:
+            logger.debug("🎯【全局捕获】收到新消息！")
+            logger.debug("  📍 聊天ID: {}", chat_id)
+            logger.debug("  📍 消息ID: {}", message.id)
+            logger.debug("  📍 聊天类型: {}", chat_type)
+            logger.debug("  📍 聊天标题: {}", getattr(chat, 'title', 'N/A'))
+
+            # 显示发送者信息
+            if message.from_user:
+                sender = message.from_user
+                sender_name = sender.username or sender.first_name or 'Unknown'
+                logger.debug("  👤 发送者用户: {} ({})", sender_name, sender.id)
+            elif message.sender_chat:
+                sender = message.sender_chat
+                sender_name = getattr(sender, 'title', 'Unknown')
+                logger.debug("  📢 发送者频道: {} ({})", sender_name, sender.id)
+
+            # 显示消息内容预览
+            if message.text:
+                logger.opt(lazy=True).debug("  📝 内容预览: {}", lambda: _preview(message.text, 200))
+            elif message.caption:
+                logger.opt(lazy=True).debug("  🖼️  媒体描述: {}", lambda: _preview(message.caption, 200))
+
+        # ==================== 智能过滤和处理 ====================
+        logger.debug("✅【处理决定】处理此消息 (类型: {})", message_type)
+
+        # 特殊处理：群组和私聊消息，检查是否包含 Pump Alert 信息
+        if message_type in ["group", "private"] and message.text:
+            logger.debug("🔍【非频道消息检查】检查是否包含 Pump/Alert 关键词...")
+            if self._PUMP_OR_ALERT_RE.search(message.text):
+                logger.debug("🎯【特殊消息】群组/私聊消息包含 Pump/Alert 关键词！")
+                # 继续处理，可能包含重要信息
+
+        # 特殊调试：针对 Pump Alert 频道和 Bot 消息的详细日志
+        if chat_id == -1002115686230:
+            logger.debug("🚨【特殊频道】收到 PUMP ALERT 频道消息！")
+
+        # Bot 消息特殊处理：检查是否包含 Pump Alert 信息
+        pump_alert_data = None
+        if message_type == "bot" and message.text and self._PUMP_RE.search(message.text):
+            logger.debug("🎯【Bot关键词】Bot消息包含 PUMP 关键词！")
+
+            # 检查是否包含 Pump Alert 频道信息
+            if self._PUMP_ALERT_SOURCE_RE.search(message.text):
+                logger.debug("🎯【确认PumpAlert】这是 Pump Alert 的 Bot 转发消息！")
+                # 将 Bot 消息视为 Pump Alert 频道消息进行处理
+                pump_alert_data = {
+                    'channel_id': -1002115686230,
+                    'channel_name': 'Pump Alert - GMGN',
+                    'message_id': message.id,
+                    'text': message.text,
+                    'timestamp': int(message.date.timestamp()),
+                    'sender': f"Bot_{chat_id}",
+                    'is_bot_forward': True
+                }
+
+        # ✅ 更新统计
+        self.stats.messages_received += 1
+        self.stats.last_message_time = message.date
+
+        try:
+            # 提取消息数据（Bot 转发的 Pump Alert 使用映射后的数据），
+            # 之后的日志和转发都复用这一份结果，不再重复读取消息属性
+            message_data = pump_alert_data or self.extract_message_data(message)
+            effective_channel_id, effective_channel_name = self._resolve_effective(
+                message, message_type, message_data
+            )
+            self.stats.mark_active(effective_channel_id)
+
+            logger.debug("📨【消息详情】正在处理:")
+            logger.debug("  📍 来源: {} ({})", effective_channel_name, effective_channel_id)
+            logger.debug("  📝 消息ID: {}", message_data['message_id'])
+            logger.opt(lazy=True).debug("  ⏰ 时间: {}", lambda: message.date.isoformat(' ', 'seconds'))
+            logger.debug("  👤 发送者: {}", message_data['sender'])
+            # 媒体消息的 text 已是 [Media: ...] 占位，无需再次判断媒体类型
+            logger.opt(lazy=True).debug("  📝 内容: {}", lambda: _preview(message_data['text'], 100))
+
+            # 加入发送队列，由后台任务批量转发到 Rust 服务
+            logger.debug("⬆️【转发到Rust】加入发送队列...")
+            self._enqueue(message_data)
+
+            # 按条数/时间间隔输出统计
+            self._maybe_log_stats()
+
+        except Exception as e:
+            self.stats.messages_failed += 1
+            self._log_message_error(e)
+
+    async def _drain_loop(self):
+        """后台任务：从发送队列攒批，批量转发到 Rust 服务并更新统计"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+
+            # 先取走已排队的消息，队列空时最多再等待 _BATCH_LINGER 秒
+            deadline = loop.time() + self._BATCH_LINGER
+            while len(batch) < self._BATCH_MAX_SIZE:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._spawn_send(batch, [0] * len(batch))
+            # 已交给发送任务，_flush_pending 据此判断队列是否发完
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _retry_loop(self):
+        """后台任务：到达重试时间后，把已到期的失败消息合并为一批重新发送"""
+        loop = asyncio.get_running_loop()
+        heap = self._retry_heap
+        while True:
+            # 等待堆顶到期；期间有新消息入堆时重新检查堆顶，更早到期的消息不会排在后面
+            delay = heap[0][0] - loop.time() if heap else None
+            if delay is None or delay > 0:
+                self._retry_added.clear()
+                try:
+                    await asyncio.wait_for(self._retry_added.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            batch, attempts = [], []
+            now = loop.time()
+            while heap and heap[0][0] <= now and len(batch) < self._BATCH_MAX_SIZE:
+                _, _, attempt, message_data = heapq.heappop(heap)
+                batch.append(message_data)
+                attempts.append(attempt)
+
+            await self._spawn_send(batch, attempts)
+
+    async def _flush_pending(self):
+        """停止时发完发送队列中的消息，并等待在途批次（包括期间到期的重试）结束"""
+        await self._queue.join()
+        while self._send_tasks:
+            await asyncio.wait(list(self._send_tasks))
+
+    def _enqueue(self, message_data: Dict):
+        """放入发送队列；队列已满时丢弃消息，避免阻塞 Pyrogram 的消息分发"""
+        try:
+            self._queue.put_nowait(message_data)
+        except asyncio.QueueFull:
+            self.stats.messages_dropped += 1
+            logger.warning(f"⚠️  发送队列已满，丢弃消息: {message_data['message_id']}")
+
+    async def _spawn_send(self, batch: List[Dict], attempts: List[int]):
+        """等待空闲发送槽位后在后台发送一批消息"""
+        await self._send_slots.acquire()
+        task = asyncio.create_task(self._send_batch(batch, attempts))
+        self._send_tasks.add(task)
+        task.add_done_callback(self._send_tasks.discard)
+
+    async def _send_batch(self, batch: List[Dict], attempts: List[int]):
+        """发送一批消息并更新统计，失败的消息按指数退避进入重试队列，熔断中未发送的消息等熔断结束后重发"""
+        try:
+            # 重试只由本类的重试队列负责，发送器每条消息只尝试一次，避免两层重试叠加
+            results = await self.http_sender.send_batch_async(batch, max_retries=0)
+        except asyncio.CancelledError:
+            # 停止时被取消的在途批次不会再发送，计为失败
+            self.stats.messages_failed += len(batch)
+            raise
+        except Exception as e:
+            logger.error(f"✗ 批量发送异常: {type(e).__name__}: {e}")
+            results = [False] * len(batch)
+        finally:
+            self._send_slots.release()
+
+        now = asyncio.get_running_loop().time()
+        for message_data, attempt, success in zip(batch, attempts, results):
+            if success:
+                self.stats.messages_sent += 1
+                logger.debug("✓ 消息处理完成: {}", message_data['message_id'])
+                continue
+
+            if success is None:
+                # 熔断中未实际发送：不消耗重试次数，熔断结束后重新发送
+                retry = (now + self.http_sender.breaker_remaining(), attempt)
+            elif attempt < self._RETRY_MAX_ATTEMPTS:
+                retry = (now + self._RETRY_BASE_DELAY * 2 ** attempt, attempt + 1)
+            else:
+                retry = None
+
+            if retry is None:
+                self.stats.messages_failed += 1
+                logger.warning(f"⚠️  消息发送失败: {message_data['message_id']}")
+            elif len(self._retry_heap) >= self._RETRY_QUEUE_SIZE:
+                self.stats.messages_failed += 1
+                logger.warning(f"⚠️  重试队列已满，放弃重发消息: {message_data['message_id']}")
+            else:
+                retry_at, next_attempt = retry
+                heapq.heappush(self._retry_heap, (retry_at, next(self._retry_seq), next_attempt, message_data))
+                self._retry_added.set()
+                logger.debug("消息 {} 将在 {:.1f} 秒后重新发送", message_data['message_id'], retry_at - now)
+
+    @staticmethod
+    def _resolve_effective(message: Message, message_type: str, message_data: Dict) -> Tuple[int, str]:
+        """确定消息的有效频道/聊天 ID 和显示名称"""
+        if message_data.get('is_bot_forward'):
+            # Bot 转发的 Pump Alert 消息映射到实际频道
+            return message_data['channel_id'], message_data['channel_name']
+        if message_type == "group":
+            return message.chat.id, message.chat.title or f'Group_{message.chat.id}'
+        if message_type == "private":
+            sender_name = message.from_user.username if message.from_user else None
+            return message.chat.id, f"Private_{sender_name or 'Unknown'}"
+        return message_data['channel_id'], message_data['channel_name']
+
+    def _maybe_log_stats(self):
+        """累计接收达到下一个阈值或距上次输出超过 _STATS_LOG_INTERVAL 秒时输出一行统计"""
+        stats = self.stats
+        now = time.monotonic()
+        if (stats.messages_received >= self._stats_log_next
+                or now - self._stats_logged_at >= self._STATS_LOG_INTERVAL):
+            self._stats_log_next = stats.messages_received + self._STATS_LOG_EVERY
+            self._stats_logged_at = now
+            logger.info(
+                "📊 实时统计: 累计接收 {} | 成功发送 {} | 发送失败 {} | 队列丢弃 {} | 活跃频道 {}",
+                stats.messages_received,
+                stats.messages_sent,
+                stats.messages_failed,
+                stats.messages_dropped,
+                len(stats.channels_active),
+            )
+
+    def _log_message_error(self, e: Exception):
+        """记录消息处理异常，同一 (类型, 消息) 只输出一次完整堆栈"""
+        key = (type(e).__name__, str(e))
+        if key in self._logged_excs:
+            logger.error("处理消息时出错: {}: {}", *key)
+            return
+
+        if len(self._logged_excs_order) >= self._MAX_LOGGED_EXCS:
+            self._logged_excs.discard(self._logged_excs_order.popleft())
+        self._logged_excs.add(key)
+        self._logged_excs_order.append(key)
+        logger.opt(exception=e).error("处理消息时出错: {}: {}", *key)
 
     async def verify_channels(self):
         """验证所有频道的访问权限"""
@@ -433,14 +618,27 @@ class TelegramMonitor:
         verified_channels = []
         failed_channels = []
 
-        for i, channel_id in enumerate(self.channel_ids, 1):
-            try:
-                chat = await self.client.get_chat(channel_id)
-                logger.info(f"  ✓ [{i}] 频道可访问: {chat.title} ({channel_id})")
-                verified_channels.append(channel_id)
-            except Exception as e:
-                logger.error(f"  ✗ [{i}] 无法访问频道 {channel_id}: {e}")
+        # 并发请求所有频道，信号量限制同时在途的 RPC 数量以免触发限流
+        semaphore = asyncio.Semaphore(20)
+
+        async def fetch_chat(channel_id):
+            async with semaphore:
+                # get_chat 同时把 access_hash 写入会话存储，之后解析该频道无需额外 RPC
+                return await self.client.get_chat(channel_id)
+
+        channel_ids = list(self.channel_ids)
+        results = await asyncio.gather(
+            *(fetch_chat(channel_id) for channel_id in channel_ids),
+            return_exceptions=True
+        )
+
+        for i, (channel_id, result) in enumerate(zip(channel_ids, results), 1):
+            if isinstance(result, Exception):
+                logger.error(f"  ✗ [{i}] 无法访问频道 {channel_id}: {result}")
                 failed_channels.append(channel_id)
+            else:
+                logger.info(f"  ✓ [{i}] 频道可访问: {result.title} ({channel_id})")
+                verified_channels.append(channel_id)
 
         # 更新监控列表为仅包含验证通过的频道
         logger.info(f"✓ 频道验证完成: {len(verified_channels)} 个可用, {len(failed_channels)} 个失败")
@@ -452,64 +650,48 @@ class TelegramMonitor:
 
     def extract_message_data(self, message: Message) -> Dict:
         """提取消息数据 - 保持原有功能"""
+        # 每个 Pyrogram 属性只读取一次
+        chat = message.chat
+        from_user = message.from_user
+        text = message.text or message.caption
+
+        if not text:
+            # 媒体消息没有文本时使用媒体类型占位
+            text = _media_placeholder(self.get_media_type(message))
+        elif len(text) > self._MAX_TEXT_LEN:
+            # 仅超长时才复制截断；Rust 端按字节限制为 50000，4000 个字符不会超限
+            text = text[:self._MAX_TEXT_LEN] + self._TRUNC_SUFFIX
+
         data = {
-            'channel_id': message.chat.id,
-            'channel_name': message.chat.title or 'Unknown',
+            'channel_id': chat.id,
+            'channel_name': chat.title or 'Unknown',
             'message_id': message.id,
-            'text': '',
+            'text': text,
             'timestamp': int(message.date.timestamp()),
-            'sender': None,
+            'sender': (
+                f"{from_user.username or from_user.first_name or 'Unknown'} ({from_user.id})"
+                if from_user else None
+            ),
         }
 
-        # 提取文本
-        if message.text:
-            data['text'] = message.text
-        elif message.caption:
-            data['text'] = message.caption
-        else:
-            # 媒体消息，没有文本
-            media_type = self.get_media_type(message)
-            data['text'] = f"[Media: {media_type}]"
-
-        # 提取发送者信息
-        if message.from_user:
-            user = message.from_user
-            username = user.username or user.first_name or 'Unknown'
-            user_id = user.id
-            data['sender'] = f"{username} ({user_id})"
-
-        # 限制文本长度
-        if len(data['text']) > 4000:
-            data['text'] = data['text'][:4000] + '... [截断]'
-
-        logger.debug(f"消息数据提取完成: {data['channel_name']} - {data['message_id']}")
+        logger.debug("消息数据提取完成: {} - {}", data['channel_name'], data['message_id'])
         return data
 
     def get_media_type(self, message: Message) -> str:
         """获取媒体类型 - 保持原有功能"""
-        if message.photo:
-            return "Photo"
-        elif message.video:
-            return "Video"
-        elif message.audio:
-            return "Audio"
-        elif message.document:
-            return f"Document: {message.document.file_name or 'Unknown'}"
-        elif message.sticker:
-            return "Sticker"
-        elif message.animation:
-            return "Animation"
-        elif message.voice:
-            return "Voice"
-        elif message.video_note:
-            return "Video Note"
-        elif message.poll:
-            return "Poll"
-        else:
-            return "Unknown Media"
+        for attr, label in self._MEDIA_ATTRS:
+            media = getattr(message, attr, None)
+            if media:
+                return label(media)
+
+        return "Unknown Media"
 
     async def stop_async(self):
-        """异步停止监控"""
-        if self.client and self.client.is_connected:
-            await self.client.stop()
-            logger.info("Telegram 客户端已断开连接")
\ No newline at end of file
+        """异步停止监控：断开 Telegram 客户端并关闭 HTTP 连接池"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+        client, self.client = self.client, None
+        if client and client.is_connected:
+            await client.stop()
+            logger.info("Telegram 客户端已断开连接")
+        await self.http_sender.close()
\ No newline at end of file
@@ -4,21 +4,16 @@
 """
 
 import asyncio
-import configparser
-import sys
 import gc
 from pathlib import Path
 from loguru import logger
 from pyrogram import Client
-import os
+
+from src.config_loader import load_config, load_proxy_from_env
+from src.log_setup import setup
 
 # 配置日志
-logger.remove()
-logger.add(
-    sys.stderr,
-    format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{message}</cyan>",
-    level="DEBUG"
-)
+setup("DEBUG")
 
 # 全局变量防止垃圾回收
 _global_client = None
@@ -28,32 +23,21 @@ def create_monitor():
     global _global_client
 
     # 加载配置
-    config = configparser.ConfigParser()
-    config.read("config.ini")
+    config = load_config("config.ini")
 
-    api_id = int(config['telegram']['api_id'])
+    api_id = config['telegram']['api_id']
     api_hash = config['telegram']['api_hash']
     session_file = config['telegram']['session_file']
-    channel_ids = [int(id.strip()) for id in config['telegram']['channel_ids'].split(',')]
+    channel_ids = list(config['telegram']['channel_ids'])
 
     logger.info(f"API ID: {api_id}")
     logger.info(f"会话文件: {session_file}")
     logger.info(f"监控频道: {channel_ids}")
 
     # 检查代理
-    proxy = None
-    http_proxy = os.environ.get('http_proxy') or os.environ.get('HTTP_PROXY')
-    if http_proxy:
-        logger.info(f"检测到代理: {http_proxy}")
-        if http_proxy.startswith('http://'):
-            proxy_url = http_proxy[7:]
-            if ':' in proxy_url:
-                hostname, port = proxy_url.split(':')
-                proxy = {
-                    "scheme": "http",
-                    "hostname": hostname,
-                    "port": int(port)
-                }
+    proxy = load_proxy_from_env()
+    if proxy:
+        logger.info(f"检测到代理: {proxy['hostname']}:{proxy['port']}")
 
     # 关键：存储到全局变量防止垃圾回收
     _global_client = Client(session_file, api_id=api_id, api_hash=api_hash, proxy=proxy)
@@ -5,52 +5,36 @@
 """
 
 import asyncio
-import configparser
-import sys
 from pathlib import Path
 from loguru import logger
 from pyrogram import Client
-import os
+
+from src.config_loader import load_config, load_proxy_from_env
+from src.log_setup import setup
 
 # 配置日志
-logger.remove()
-logger.add(
-    sys.stderr,
-    format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{message}</cyan>",
-    level="DEBUG"
-)
+setup("DEBUG")
 
 class TestMonitor:
     """测试版本的监控器 - 完全复制 debug_monitor.py 的逻辑"""
 
     def __init__(self):
         # 加载配置
-        config = configparser.ConfigParser()
-        config.read("config.ini")
+        config = load_config("config.ini")
 
-        self.api_id = int(config['telegram']['api_id'])
+        self.api_id = config['telegram']['api_id']
         self.api_hash = config['telegram']['api_hash']
         self.session_file = config['telegram']['session_file']
-        self.channel_ids = [int(id.strip()) for id in config['telegram']['channel_ids'].split(',')]
+        self.channel_ids = list(config['telegram']['channel_ids'])
 
         logger.info(f"API ID: {self.api_id}")
         logger.info(f"会话文件: {self.session_file}")
         logger.info(f"监控频道: {self.channel_ids}")
 
         # 创建客户端（与 debug_monitor.py 完全相同的方式）
-        proxy = None
-        http_proxy = os.environ.get('http_proxy') or os.environ.get('HTTP_PROXY')
-        if http_proxy:
-            logger.info(f"检测到代理: {http_proxy}")
-            if http_proxy.startswith('http://'):
-                proxy_url = http_proxy[7:]
-                if ':' in proxy_url:
-                    hostname, port = proxy_url.split(':')
-                    proxy = {
-                        "scheme": "http",
-                        "hostname": hostname,
-                        "port": int(port)
-                    }
+        proxy = load_proxy_from_env()
+        if proxy:
+            logger.info(f"检测到代理: {proxy['hostname']}:{proxy['port']}")
 
         # 关键：完全相同的客户端创建方式
         self.client = Client(self.session_file, api_id=self.api_id, api_hash=self.api_hash, proxy=proxy)
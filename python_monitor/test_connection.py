@@ -3,20 +3,15 @@
 测试 Telegram 连接状态反馈功能
 """
 
-import sys
-import os
 import asyncio
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.config_loader import load_config
+from src.log_setup import setup
 from src.http_sender import HttpSender
 from src.telegram_client import TelegramMonitor
-from loguru import logger
 
-# 移除默认的日志处理器
-logger.remove()
-# 添加新的日志处理器，显示时间、级别和消息
-logger.add(sys.stderr, format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{message}</cyan>", level="INFO")
+# 配置日志
+setup("INFO")
 
 async def test_connection():
     """测试连接并显示详细状态"""
@@ -5,20 +5,23 @@
 """
 
 import asyncio
-import configparser
-import sys
+import signal
 from pathlib import Path
 from loguru import logger
-from pyrogram import Client
-import os
+from pyrogram import Client, filters
+from pyrogram.handlers import MessageHandler
+
+from src.config_loader import get_config, load_proxy_from_env
+from src.log_setup import setup
+
+# uvloop（libuv 实现的事件循环）在 Windows 上不可用，缺失时回退到标准 asyncio
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # 配置日志（完全相同的配置）
-logger.remove()
-logger.add(
-    sys.stderr,
-    format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{message}</cyan>",
-    level="DEBUG"
-)
+setup("DEBUG")
 
 class ExactCopyMonitor:
     """完全复制 debug_monitor.py 的逻辑，但用类封装"""
@@ -26,17 +29,17 @@ class ExactCopyMonitor:
     def __init__(self):
         """构造函数 - 完全复制 debug_monitor.py 的初始化逻辑"""
         # 加载配置（完全相同的代码）
-        config = configparser.ConfigParser()
-        config.read("config.ini")
+        config = get_config("config.ini")
 
         api_id = int(config['telegram']['api_id'])
         api_hash = config['telegram']['api_hash']
         session_file = config['telegram']['session_file']
-        channel_ids = [int(id.strip()) for id in config['telegram']['channel_ids'].split(',')]
+        # int() 自身会忽略首尾空白，无需逐项 strip
+        channel_ids = frozenset(map(int, config['telegram']['channel_ids'].split(',')))
 
         logger.info(f"API ID: {api_id}")
         logger.info(f"会话文件: {session_file}")
-        logger.info(f"监控频道: {channel_ids}")
+        logger.info(f"监控频道: {sorted(channel_ids)}")
 
         # 保存到实例属性
         self.api_id = api_id
@@ -44,39 +47,26 @@ class ExactCopyMonitor:
         self.session_file = session_file
         self.channel_ids = channel_ids
 
-        # 检查代理（完全相同的逻辑）
-        proxy = None
-        http_proxy = os.environ.get('http_proxy') or os.environ.get('HTTP_PROXY')
-        if http_proxy:
-            logger.info(f"检测到代理: {http_proxy}")
-            if http_proxy.startswith('http://'):
-                proxy_url = http_proxy[7:]
-                if ':' in proxy_url:
-                    hostname, port = proxy_url.split(':')
-                    proxy = {
-                        "scheme": "http",
-                        "hostname": hostname,
-                        "port": int(port)
-                    }
+        # 检查代理
+        proxy = load_proxy_from_env()
 
         # 关键：完全相同的客户端创建方式
         self.client = Client(self.session_file, api_id=self.api_id, api_hash=self.api_hash, proxy=proxy)
 
-        # 关键：完全相同的处理器注册方式
-        @self.client.on_message()
-        async def message_handler(client, message):
-            """处理所有收到的消息 - 完全复制 debug_monitor.py"""
-            logger.info("✅✅✅ EXACT COPY Handler触发！收到消息！✅✅✅")
-            logger.info(f"  聊天ID: {message.chat.id}")
-            logger.info(f"  消息ID: {message.id}")
-            logger.info(f"  聊天类型: {message.chat.type}")
-            logger.info(f"  聊天标题: {getattr(message.chat, 'title', 'N/A')}")
-
-            # 检查是否在监控列表中
-            if message.chat.id in self.channel_ids:
-                logger.info(f"🎯 消息来自监控频道: {message.chat.id}")
-            else:
-                logger.info(f"📍 消息来自非监控频道: {message.chat.id}")
+        # 处理器注册为绑定方法，非监控频道的消息由 Pyrogram 过滤器直接丢弃
+        self.client.add_handler(MessageHandler(self._on_message, filters.chat(list(channel_ids))))
+
+    async def _on_message(self, client, message):
+        """处理监控频道的消息 - 完全复制 debug_monitor.py"""
+        logger.info("✅✅✅ EXACT COPY Handler触发！收到消息！✅✅✅")
+        # 日志参数交给 loguru 延迟格式化，级别被过滤时不拼接字符串
+        chat = message.chat
+        chat_id = chat.id
+        logger.info("  聊天ID: {}", chat_id)
+        logger.info("  消息ID: {}", message.id)
+        logger.info("  聊天类型: {}", chat.type)
+        logger.opt(lazy=True).info("  聊天标题: {}", lambda: getattr(chat, 'title', 'N/A'))
+        logger.info("🎯 消息来自监控频道: {}", chat_id)
 
     async def start_async(self):
         """完全复制 debug_monitor.py 的主函数逻辑"""
@@ -88,11 +78,20 @@ class ExactCopyMonitor:
         await self.client.start()
         logger.info("✓ 客户端启动成功")
 
-        # 保持运行（完全相同的逻辑）
+        # 启动（含交互式登录）完成后才接管 Ctrl+C，登录时仍可直接中断；
+        # 之后 Ctrl+C 直接唤醒等待，无需等到超时
+        stop_event = asyncio.Event()
         try:
-            await asyncio.sleep(300)  # 运行5分钟
-        except KeyboardInterrupt:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGINT, stop_event.set)
+        except NotImplementedError:
+            pass  # Windows 事件循环不支持信号处理器，仍由 KeyboardInterrupt 退出
+
+        # 保持运行，最多5分钟
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=300)
             logger.info("用户中断")
+        except asyncio.TimeoutError:
+            pass
         finally:
             await self.client.stop()
             logger.info("精确复制测试完成")
@@ -104,8 +103,7 @@ class ExactCopyMonitor:
         except KeyboardInterrupt:
             logger.info("\n用户中断，程序退出")
         except Exception as e:
-            logger.error(f"运行错误: {type(e).__name__}: {e}")
-            logger.exception(e)
+            logger.opt(exception=e).error("运行错误: {}: {}", type(e).__name__, e)
 
 if __name__ == "__main__":
     print("【精确复制监控器 - 完全复制 debug_monitor.py 逻辑】")
@@ -113,5 +111,8 @@ if __name__ == "__main__":
     print("=" * 60)
     print()
 
+    if uvloop is not None:
+        uvloop.install()
+
     monitor = ExactCopyMonitor()
     monitor.start()
\ No newline at end of file
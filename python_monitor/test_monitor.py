@@ -6,10 +6,21 @@
 """
 
 import asyncio
+import signal
+import sys
 from pyrogram import Client, filters
 from loguru import logger
 from pathlib import Path
 
+from src.config_loader import get_config, load_proxy_from_env
+from src.log_setup import setup
+
+# uvloop（libuv 实现的事件循环）在 Windows 上不可用，缺失时回退到标准 asyncio
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # 配置 - 从config.ini加载
 CONFIG_FILE = "config.ini"
 
@@ -20,9 +31,7 @@ def load_api_config():
         logger.error(f"配置文件 {CONFIG_FILE} 不存在")
         return None, None
 
-    import configparser
-    config = configparser.ConfigParser()
-    config.read(CONFIG_FILE)
+    config = get_config(CONFIG_FILE)
 
     api_id = int(config['telegram']['api_id'])
     api_hash = config['telegram']['api_hash']
@@ -37,17 +46,8 @@ if not API_ID or not API_HASH:
 
 SESSION_FILE = "my_monitor.session"
 
-# 添加当前目录到路径
-import sys, os
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
 # 日志配置
-logger.remove()
-logger.add(
-    sys.stderr,
-    format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{message}</cyan>",
-    level="INFO"
-)
+setup("INFO")
 
 # 测试时可以修改为只监控特定频道，或者设为 None 监听所有消息
 # 从 config.ini 读取频道ID
@@ -59,14 +59,13 @@ def load_channel_ids():
         logger.warning(f"配置文件 {CONFIG_FILE} 不存在，将监听所有聊天")
         return None
 
-    import configparser
-    config = configparser.ConfigParser()
-    config.read(CONFIG_FILE)
+    config = get_config(CONFIG_FILE)
 
     if 'telegram' in config and 'channel_ids' in config['telegram']:
         channel_ids_str = config['telegram']['channel_ids']
-        channel_ids = [int(id.strip()) for id in channel_ids_str.split(',')]
-        logger.info(f"从配置文件加载频道ID: {channel_ids}")
+        # int() 自身会忽略首尾空白，无需逐项 strip
+        channel_ids = frozenset(map(int, channel_ids_str.split(',')))
+        logger.info(f"从配置文件加载频道ID: {sorted(channel_ids)}")
         return channel_ids
     else:
         logger.warning("配置文件中未找到 channel_ids，将监听所有聊天")
@@ -85,50 +84,34 @@ async def test_monitor():
     logger.info("正在启动 Pyrogram 客户端...")
 
     try:
-        # 创建客户端
-        app = Client(SESSION_FILE, api_id=API_ID, api_hash=API_HASH)
-
-        # 检查是否需要代理
-        http_proxy = os.environ.get('http_proxy') or os.environ.get('HTTP_PROXY')
-        if http_proxy:
-            logger.info(f"检测到代理: {http_proxy}")
-            if http_proxy.startswith('http://'):
-                proxy_url = http_proxy[7:]
-                if ':' in proxy_url:
-                    hostname, port = proxy_url.split(':')
-                    app.proxy = {
-                        "scheme": "http",
-                        "hostname": hostname,
-                        "port": int(port)
-                    }
-                    logger.info(f"配置代理: {app.proxy}")
-
-        # 添加handler - 监听所有消息（不搞任何过滤）
-        @app.on_message()
+        # 创建客户端（代理从环境变量读取）
+        app = Client(SESSION_FILE, api_id=API_ID, api_hash=API_HASH, proxy=load_proxy_from_env())
+
+        # 添加handler - 配置了频道时由 Pyrogram 过滤器只放行这些频道，否则监听所有消息
+        @app.on_message(filters.chat(list(channel_ids)) if channel_ids else None)
         async def test_handler(client, message):
-            """测试消息处理器 - 监听所有消息"""
+            """测试消息处理器"""
             logger.info("✅✅✅ Handler触发！收到消息！✅✅✅")
-            logger.info(f"  聊天类型: {message.chat.type}")
-            logger.info(f"  聊天ID: {message.chat.id}")
-            logger.info(f"  聊天标题: {getattr(message.chat, 'title', 'N/A')}")
-            logger.info(f"  消息ID: {message.id}")
-            logger.info(f"  时间: {message.date}")
+            # 日志参数交给 loguru 延迟格式化，级别被过滤时不拼接字符串
+            chat = message.chat
+            logger.info("  聊天类型: {}", chat.type)
+            logger.info("  聊天ID: {}", chat.id)
+            logger.opt(lazy=True).info("  聊天标题: {}", lambda: getattr(chat, 'title', 'N/A'))
+            logger.info("  消息ID: {}", message.id)
+            logger.info("  时间: {}", message.date)
 
             # 发送者信息
             if message.from_user:
                 sender = message.from_user
-                sender_name = sender.username or sender.first_name or 'Unknown'
-                logger.info(f"  发送者: {sender_name} ({sender.id})")
+                logger.info("  发送者: {} ({})", sender.username or sender.first_name or 'Unknown', sender.id)
             elif message.sender_chat:
-                sender = message.sender_chat
-                sender_name = getattr(sender, 'title', 'Unknown')
-                logger.info(f"  发送者: {sender_name} (频道)")
+                logger.opt(lazy=True).info("  发送者: {} (频道)", lambda: getattr(message.sender_chat, 'title', 'Unknown'))
 
             # 消息内容
             if message.text:
-                logger.info(f"  文本内容: {message.text[:200]}")
+                logger.info("  文本内容: {}", message.text[:200])
             elif message.caption:
-                logger.info(f"  媒体描述: {message.caption[:200]}")
+                logger.info("  媒体描述: {}", message.caption[:200])
             else:
                 media_type = "Unknown"
                 if message.photo:
@@ -139,7 +122,7 @@ async def test_monitor():
                     media_type = f"Document: {message.document.file_name}"
                 elif message.audio:
                     media_type = "Audio"
-                logger.info(f"  媒体类型: {media_type}")
+                logger.info("  媒体类型: {}", media_type)
 
             logger.info("=" * 60)
 
@@ -153,24 +136,32 @@ async def test_monitor():
 
         # 显示监控的频道
         if channel_ids:
-            logger.info(f"监控的频道ID: {channel_ids}")
+            logger.info(f"监控的频道ID: {sorted(channel_ids)}")
         else:
             logger.info("监控所有聊天（未配置特定频道）")
 
         logger.info("=" * 60)
 
-        # 保持运行
+        # 启动（含交互式登录）完成后才接管 Ctrl+C，登录时仍可直接中断；
+        # 之后 Ctrl+C 直接唤醒等待，无需等到超时
+        stop_event = asyncio.Event()
         try:
-            await asyncio.sleep(3600)  # 测试1小时
-        except KeyboardInterrupt:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGINT, stop_event.set)
+        except NotImplementedError:
+            pass  # Windows 事件循环不支持信号处理器，仍由 KeyboardInterrupt 退出
+
+        # 保持运行，最多测试1小时
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=3600)
             logger.info("\n用户中断，正在停止...")
+        except asyncio.TimeoutError:
+            pass
 
         await app.stop()
         logger.info("测试完成")
 
     except Exception as e:
-        logger.error(f"启动失败: {e}")
-        logger.exception(e)
+        logger.opt(exception=e).error("启动失败: {}", e)
         sys.exit(1)
 
 
@@ -185,4 +176,7 @@ if __name__ == "__main__":
     print("=" * 60)
     print()
 
+    if uvloop is not None:
+        uvloop.install()
+
     asyncio.run(test_monitor())
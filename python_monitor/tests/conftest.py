@@ -0,0 +1,43 @@
+"""
+pytest 公共夹具
+
+需要先启动 Rust 服务（默认 http://localhost:8080）；服务不可用时，依赖服务的用例会被跳过
+"""
+
+import pytest
+
+from src.http_sender import HttpSender
+from src.models import TelegramMessage
+
+RUST_URL = 'http://localhost:8080/api/v1/message'
+
+
+@pytest.fixture(scope='module')
+def sender():
+    """模块内共享的发送器；每个模块新建，熔断等状态不会跨模块泄漏"""
+    return HttpSender({
+        'url': RUST_URL,
+        'max_retries': 2,
+        'timeout': 5
+    })
+
+
+@pytest.fixture(scope='module')
+def rust_service(sender):
+    """确认 Rust 服务可用，否则跳过依赖服务的用例"""
+    if not sender.health_check():
+        pytest.skip(f"Rust 服务不可用: {RUST_URL}")
+    return sender
+
+
+@pytest.fixture
+def message():
+    """格式完整的测试消息"""
+    return TelegramMessage(
+        channel_id=-1001234567890,
+        channel_name="测试频道",
+        message_id=12345,
+        text="新币发射：TestToken 合约地址 0x1234567890abcdef 可以考虑买入",
+        timestamp=1700000000,
+        sender="test_user (12345)",
+    )
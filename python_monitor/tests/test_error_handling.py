@@ -0,0 +1,78 @@
+"""
+测试错误处理
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.http_sender import HttpSender
+
+MISSING_FIELDS = {
+    "channel_id": -100123,
+    "text": "只有部分字段的消息"
+}
+
+
+@pytest.fixture
+def sender_bad():
+    """指向错误端口的发送器；首次失败即熔断，每个用例新建以免熔断状态互相影响"""
+    return HttpSender({
+        'url': 'http://localhost:9999/api/v1/message',
+        'max_retries': 2,
+        'timeout': 3,
+        'breaker_threshold': 1
+    })
+
+
+def _gather(senders, *coros):
+    """在一个事件循环中并发执行协程；异步会话绑定在该循环上，结束前一并关闭"""
+    async def main():
+        try:
+            return await asyncio.gather(*coros)
+        finally:
+            for sender in senders:
+                await sender.close()
+
+    return asyncio.run(main())
+
+
+async def _in_thread(func):
+    """在线程池中执行阻塞调用（asyncio.to_thread 需要 Python 3.9）"""
+    return await asyncio.get_running_loop().run_in_executor(None, func)
+
+
+def test_missing_fields(rust_service):
+    assert not rust_service.send_message(MISSING_FIELDS)
+
+
+def test_unreachable(sender_bad, message, monkeypatch):
+    assert not sender_bad.send_message(message)
+
+    # 熔断已打开：再次发送应立即失败，不发起任何请求
+    # 只替换该实例的会话，进程共享的 requests 会话不受影响
+    requests_made = []
+    monkeypatch.setattr(sender_bad, 'session', SimpleNamespace(post=lambda *args, **kwargs: requests_made.append(args)))
+    start = time.monotonic()
+    assert sender_bad.send_message(message) is False
+    assert time.monotonic() - start < 0.1
+    assert not requests_made
+
+
+def test_health_check(rust_service):
+    assert rust_service.health_check()
+
+
+def test_error_cases_concurrently(rust_service, sender_bad, message):
+    # 三种情况在同一事件循环中并发执行，总耗时约等于最慢的一个
+    missing_ok, unreachable_ok, healthy = _gather(
+        (rust_service, sender_bad),
+        rust_service.send_message_async(MISSING_FIELDS),
+        sender_bad.send_message_async(message),
+        _in_thread(rust_service.health_check),
+    )
+    assert not missing_ok
+    assert not unreachable_ok
+    assert healthy
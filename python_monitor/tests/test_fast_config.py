@@ -0,0 +1,51 @@
+"""
+测试轻量 INI 解析与 configparser 结果一致
+"""
+
+import configparser
+from pathlib import Path
+
+import pytest
+
+from src import fast_config
+
+SAMPLE_CONFIG = Path(__file__).resolve().parent.parent / 'config_sample.ini'
+
+MULTILINE_CONFIG = """\
+[telegram]
+api_id = 1
+channel_ids = -1001,
+    -1002,
+    -1003
+
+[rust_service]
+URL = http://localhost:8080/api/v1/message
+notes = 第一行
+
+    # 续行中的注释
+    第三行
+
+[logging]
+level = INFO
+"""
+
+
+def _configparser_sections(path):
+    parser = configparser.ConfigParser()
+    parser.read(path, encoding='utf-8')
+    return {name: dict(parser[name]) for name in parser.sections()}
+
+
+def test_sample_config_matches_configparser():
+    assert fast_config.parse(SAMPLE_CONFIG) == _configparser_sections(SAMPLE_CONFIG)
+
+
+@pytest.mark.parametrize('newline', ['\n', '\r\n'])
+def test_multiline_values_match_configparser(tmp_path, newline):
+    path = tmp_path / 'config.ini'
+    path.write_bytes(MULTILINE_CONFIG.replace('\n', newline).encode('utf-8'))
+
+    sections = fast_config.parse(path)
+
+    assert sections == _configparser_sections(path)
+    assert sections['telegram']['channel_ids'] == '-1001,\n-1002,\n-1003'
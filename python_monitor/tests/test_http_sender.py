@@ -0,0 +1,158 @@
+"""
+测试异步发送与批量发送的失败处理（使用替身 aiohttp 会话，无需 Rust 服务）
+"""
+
+import asyncio
+
+import orjson
+import pytest
+
+from src import http_sender
+from src.http_sender import HttpSender
+
+RUST_URL = 'http://rust.test/api/v1/message'
+BATCH_URL = 'http://rust.test/api/v1/messages'
+
+
+class _Response:
+    """aiohttp 响应替身"""
+
+    def __init__(self, status, body):
+        self.status = status
+        self._body = body if isinstance(body, bytes) else orjson.dumps(body)
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _Session:
+    """按顺序返回预设响应（或抛出预设异常）的 aiohttp 会话替身，记录每次请求的地址"""
+
+    closed = False
+
+    def __init__(self, *responses):
+        self._responses = list(responses)
+        self.urls = []
+
+    def post(self, url, data=None, headers=None):
+        self.urls.append(url)
+        response = self._responses.pop(0)
+        if isinstance(response, BaseException):
+            raise response
+        return response
+
+
+def _ok():
+    return _Response(200, {'success': True, 'message': 'ok', 'data': None})
+
+
+def _batch_ok(results):
+    return _Response(200, {'success': True, 'message': 'ok', 'data': {'results': results}})
+
+
+def _messages(n):
+    return [
+        {'channel_id': -100, 'channel_name': 'c', 'message_id': i, 'text': 't', 'timestamp': 0, 'sender': None}
+        for i in range(1, n + 1)
+    ]
+
+
+@pytest.fixture
+def sender(monkeypatch):
+    """每个用例新建的发送器；重试不等待退避时间"""
+    monkeypatch.setattr(http_sender, '_backoff_delay', lambda attempt: 0)
+    return HttpSender({'url': RUST_URL, 'max_retries': 2, 'timeout': 5})
+
+
+def _send_batch(sender, session, messages, **kwargs):
+    sender._aio_session = session
+    return asyncio.run(sender.send_batch_async(messages, **kwargs))
+
+
+def _send_one(sender, session, message, **kwargs):
+    sender._aio_session = session
+    return asyncio.run(sender.send_message_async(message, **kwargs))
+
+
+def test_batch_ok(sender):
+    session = _Session(_batch_ok([True, False, True]))
+    assert _send_batch(sender, session, _messages(3)) == [True, False, True]
+    assert session.urls == [BATCH_URL]
+
+
+def test_batch_404_falls_back_to_single_sends(sender):
+    session = _Session(_Response(404, b'not found'), _ok(), _ok())
+    assert _send_batch(sender, session, _messages(2)) == [True, True]
+    assert session.urls == [BATCH_URL, RUST_URL, RUST_URL]
+
+    # 之后不再尝试批量接口
+    session = _Session(_ok(), _ok())
+    assert _send_batch(sender, session, _messages(2)) == [True, True]
+    assert session.urls == [RUST_URL, RUST_URL]
+
+
+@pytest.mark.parametrize("response", [
+    _Response(503, b'unavailable'),
+    asyncio.TimeoutError(),
+    _Response(200, b'not json'),
+    _Response(200, {'success': True, 'message': 'ok', 'data': {'results': [True]}}),
+])
+def test_batch_failure_is_not_resent_per_message(sender, response):
+    """超时、5xx 和格式异常的 200 整批失败一次，计入熔断，不拆成逐条重发"""
+    session = _Session(response)
+    assert _send_batch(sender, session, _messages(3)) == [False, False, False]
+    assert session.urls == [BATCH_URL]
+    assert sender._failure_count == 1
+
+
+def test_batch_4xx_is_not_counted_by_breaker(sender):
+    session = _Session(_Response(400, b'bad request'))
+    assert _send_batch(sender, session, _messages(2)) == [False, False]
+    assert session.urls == [BATCH_URL]
+    assert sender._failure_count == 0
+
+
+def test_batch_breaker_open(sender):
+    sender._breaker_open_until = float('inf')
+    session = _Session()
+    assert _send_batch(sender, session, _messages(2)) == [None, None]
+    assert session.urls == []
+
+
+def test_single_retries_5xx(sender):
+    session = _Session(_Response(502, b'bad gateway'), _ok())
+    assert _send_one(sender, session, _messages(1)[0]) is True
+    assert len(session.urls) == 2
+    assert sender._failure_count == 0
+
+
+def test_single_does_not_retry_4xx(sender):
+    session = _Session(_Response(422, b'missing field'))
+    assert _send_one(sender, session, _messages(1)[0]) is False
+    assert len(session.urls) == 1
+    assert sender._failure_count == 0
+
+
+def test_single_max_retries_override(sender):
+    session = _Session(asyncio.TimeoutError())
+    assert _send_one(sender, session, _messages(1)[0], max_retries=0) is False
+    assert len(session.urls) == 1
+    assert sender._failure_count == 1
+
+
+def test_single_stops_when_breaker_opens_between_attempts(sender):
+    """重试前熔断已被打开时不再发起请求，返回 None 交由调用方在熔断结束后重发"""
+    class _TrippingSession(_Session):
+        def post(self, url, data=None, headers=None):
+            sender._breaker_open_until = float('inf')
+            return super().post(url, data, headers)
+
+    session = _TrippingSession(_Response(503, b'unavailable'), _ok())
+    assert _send_one(sender, session, _messages(1)[0]) is None
+    assert len(session.urls) == 1
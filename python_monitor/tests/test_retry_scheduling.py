@@ -0,0 +1,104 @@
+"""
+测试监控器发送失败后的重试调度
+"""
+
+import asyncio
+import itertools
+
+import pytest
+
+pytest.importorskip("pyrogram")
+pytest.importorskip("tgcrypto")
+
+from src.telegram_client import TelegramMonitor  # noqa: E402
+
+BREAKER_REMAINING = 7.0
+
+
+class _Sender:
+    """按预设结果返回的发送器替身，记录调用时的 max_retries"""
+
+    def __init__(self, results):
+        self.results = results
+        self.max_retries = []
+
+    async def send_batch_async(self, batch, max_retries=None):
+        self.max_retries.append(max_retries)
+        return self.results
+
+    def breaker_remaining(self):
+        return BREAKER_REMAINING
+
+
+def _message(message_id):
+    return {'channel_id': -100, 'channel_name': 'c', 'message_id': message_id, 'text': 't', 'timestamp': 0, 'sender': None}
+
+
+def _send_batch(monitor, batch, attempts):
+    """在新的事件循环中执行一次 _send_batch，返回发送前的循环时间"""
+    async def main():
+        monitor._retry_heap = []
+        monitor._retry_added = asyncio.Event()
+        monitor._retry_seq = itertools.count()
+        # 模拟 _spawn_send 已占用一个发送槽位，_send_batch 负责释放
+        monitor._send_slots = asyncio.Semaphore(1)
+        await monitor._send_slots.acquire()
+        now = asyncio.get_running_loop().time()
+        await monitor._send_batch(batch, attempts)
+        assert not monitor._send_slots.locked()
+        return now
+
+    return asyncio.run(main())
+
+
+def _monitor(results):
+    return TelegramMonitor(1, 'hash', 'session', [-100], _Sender(results))
+
+
+def test_sender_makes_single_attempt():
+    monitor = _monitor([True])
+    _send_batch(monitor, [_message(1)], [0])
+    assert monitor.http_sender.max_retries == [0]
+    assert monitor.stats.messages_sent == 1
+
+
+def test_failed_message_is_rescheduled_with_backoff():
+    monitor = _monitor([False, False])
+    now = _send_batch(monitor, [_message(1), _message(2)], [0, 2])
+
+    retries = sorted((attempt, retry_at - now) for retry_at, _, attempt, _ in monitor._retry_heap)
+    base = TelegramMonitor._RETRY_BASE_DELAY
+    assert [attempt for attempt, _ in retries] == [1, 3]
+    assert retries[0][1] == pytest.approx(base, abs=0.5)
+    assert retries[1][1] == pytest.approx(base * 4, abs=0.5)
+    assert monitor.stats.messages_failed == 0
+
+
+def test_breaker_skipped_message_keeps_its_attempt():
+    """None 表示熔断中未发送：等熔断结束后重发，不消耗重试次数"""
+    monitor = _monitor([None])
+    now = _send_batch(monitor, [_message(1)], [2])
+
+    [(retry_at, _, attempt, message_data)] = monitor._retry_heap
+    assert attempt == 2
+    assert retry_at - now == pytest.approx(BREAKER_REMAINING, abs=0.5)
+    assert message_data['message_id'] == 1
+
+
+def test_attempt_cap():
+    monitor = _monitor([False, None])
+    cap = TelegramMonitor._RETRY_MAX_ATTEMPTS
+    _send_batch(monitor, [_message(1), _message(2)], [cap, cap])
+
+    # 达到上限的失败消息不再重试；熔断中未发送的消息仍会重发
+    assert [entry[3]['message_id'] for entry in monitor._retry_heap] == [2]
+    assert monitor.stats.messages_failed == 1
+
+
+def test_full_retry_heap_counts_as_failed(monkeypatch):
+    monkeypatch.setattr(TelegramMonitor, '_RETRY_QUEUE_SIZE', 1)
+    monitor = _monitor([False, False])
+    _send_batch(monitor, [_message(1), _message(2)], [0, 0])
+
+    assert len(monitor._retry_heap) == 1
+    assert monitor.stats.messages_failed == 1
@@ -0,0 +1,7 @@
+"""
+测试消息发送
+"""
+
+
+def test_send_message(rust_service, message):
+    assert rust_service.send_message(message)
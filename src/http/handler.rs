@@ -21,6 +21,12 @@ pub struct ReceiveMessageRequest {
     pub sender: Option<String>,
 }
 
+/// 批量接收消息的请求体
+#[derive(Deserialize, Debug)]
+pub struct ReceiveMessagesRequest {
+    pub messages: Vec<ReceiveMessageRequest>,
+}
+
 /// 响应体
 #[derive(Serialize, Deserialize)]
 pub struct ApiResponse {
@@ -117,6 +123,43 @@ pub async fn receive_message(
     }
 }
 
+/// 批量接收消息的端点
+///
+/// 逐条复用单条消息的校验与处理流程，`data.results` 按请求顺序给出每条消息是否处理成功
+pub async fn receive_messages(
+    State(processor): State<Arc<MessageProcessor>>,
+    Json(request): Json<ReceiveMessagesRequest>,
+) -> impl IntoResponse {
+    let total = request.messages.len();
+    info!("收到来自 Python 监控器的批量消息: {} 条", total);
+
+    let mut results = Vec::with_capacity(total);
+    for message in request.messages {
+        // 与单条端点一致：校验失败只记录警告，仍走降级处理
+        if let Err(e) = validate_request(&message) {
+            warn!("⚠️  输入验证警告: {}", e);
+        }
+
+        let ok = match process_with_safety_checks(processor.clone(), message).await {
+            Ok(response) => response.success,
+            Err(err_msg) => {
+                error!("❌ 安全处理失败: {}", err_msg);
+                false
+            }
+        };
+        results.push(ok);
+    }
+
+    let accepted = results.iter().filter(|ok| **ok).count();
+    info!("🎉 批量消息处理完成: {}/{} 条成功", accepted, total);
+
+    ApiResponse {
+        success: true,
+        message: format!("批量消息处理完成: {}/{} 条成功", accepted, total),
+        data: Some(serde_json::json!({ "results": results })),
+    }
+}
+
 /// 健康检查端点
 pub async fn health_check() -> impl IntoResponse {
     ApiResponse::success("服务运行正常")
@@ -248,3 +291,106 @@ fn format_panic_info(panic_info: Box<dyn std::any::Any + Send>) -> String {
         "捕获到panic，但无法获取详细信息".to_string()
     }
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::ai::AIServiceFactory;
+    use crate::config::{AIConfig, Config, HttpConfig, KimiConfig, ProcessingConfig, TelegramConfig};
+    use crate::telegram::bot::TelegramBot;
+
+    // 批量大小设得足够大，测试中不会触发 AI 分析
+    fn create_test_processor() -> Arc<MessageProcessor> {
+        let config = Config {
+            telegram: TelegramConfig {
+                target_user: 8030185949,
+                bot_token: "TEST_BOT_TOKEN".to_string(),
+            },
+            http: HttpConfig { port: 8080 },
+            processing: ProcessingConfig {
+                batch_size: 100,
+                batch_timeout_seconds: 5,
+                min_confidence: 0.7,
+                keywords: vec![],
+            },
+            ai: AIConfig {
+                provider: "kimi".to_string(),
+                timeout_seconds: 30,
+                max_retries: 1,
+                prompt_template: "".to_string(),
+                kimi: Some(KimiConfig {
+                    api_key: "TEST_API_KEY".to_string(),
+                    model: "moonshot-v1-8k".to_string(),
+                    base_url: "https://api.moonshot.cn/v1".to_string(),
+                }),
+                ollama: None,
+                openai: None,
+            },
+        };
+
+        let ai_service = AIServiceFactory::create(&config.ai).expect("Should create AI service");
+        let telegram_bot = Arc::new(TelegramBot::new(config.telegram.clone()));
+        Arc::new(MessageProcessor::new(config, ai_service.into(), telegram_bot))
+    }
+
+    fn create_test_request(message_id: i32, channel_name: &str) -> ReceiveMessageRequest {
+        ReceiveMessageRequest {
+            channel_id: -1001234567890,
+            channel_name: channel_name.to_string(),
+            message_id,
+            text: format!("测试消息 {}", message_id),
+            timestamp: 1700000000,
+            sender: Some("TestUser".to_string()),
+        }
+    }
+
+    // 校验失败的消息与单条端点一致走降级处理，不影响同批其他消息，结果按请求顺序返回
+    #[tokio::test]
+    async fn test_receive_messages_mixed_batch() {
+        let request = ReceiveMessagesRequest {
+            messages: vec![
+                create_test_request(1, "TestChannel"),
+                create_test_request(0, "TestChannel"),  // 消息ID无效
+                create_test_request(2, "   "),          // 频道名称为空
+                create_test_request(3, "TestChannel"),
+            ],
+        };
+
+        let response = receive_messages(State(create_test_processor()), Json(request))
+            .await
+            .into_response();
+        assert_eq!(response.status(), StatusCode::OK);
+
+        let body = axum::body::to_bytes(response.into_body(), usize::MAX)
+            .await
+            .unwrap();
+        let api_response: ApiResponse = serde_json::from_slice(&body).unwrap();
+        assert!(api_response.success);
+
+        let results = api_response.data.unwrap()["results"].clone();
+        assert_eq!(results, serde_json::json!([true, true, true, true]));
+    }
+
+    #[tokio::test]
+    async fn test_receive_messages_empty_batch() {
+        let request = ReceiveMessagesRequest { messages: vec![] };
+
+        let response = receive_messages(State(create_test_processor()), Json(request))
+            .await
+            .into_response();
+        assert_eq!(response.status(), StatusCode::OK);
+
+        let body = axum::body::to_bytes(response.into_body(), usize::MAX)
+            .await
+            .unwrap();
+        let api_response: ApiResponse = serde_json::from_slice(&body).unwrap();
+        assert_eq!(api_response.data.unwrap()["results"], serde_json::json!([]));
+    }
+
+    #[test]
+    fn test_validate_request() {
+        assert!(validate_request(&create_test_request(1, "TestChannel")).is_ok());
+        assert!(validate_request(&create_test_request(0, "TestChannel")).is_err());
+        assert!(validate_request(&create_test_request(1, "   ")).is_err());
+    }
+}
@@ -35,6 +35,7 @@ impl HttpServer {
             .route("/health", get(handler::health_check))
             // 消息接收
             .route("/api/v1/message", post(handler::receive_message))
+            .route("/api/v1/messages", post(handler::receive_messages))
             // 频道管理
             .route("/api/v1/channels", get(channel_handler::get_channels))
             .route("/api/v1/channels", post(channel_handler::add_channel))
@@ -52,6 +53,7 @@ impl HttpServer {
         info!("API 端点:");
         info!("  - GET  /health                          - 健康检查");
         info!("  - POST /api/v1/message                  - 接收消息");
+        info!("  - POST /api/v1/messages                 - 批量接收消息");
         info!("  - GET  /api/v1/channels                 - 获取频道列表");
         info!("  - POST /api/v1/channels                 - 添加频道");
         info!("  - PUT  /api/v1/channels                 - 更新频道列表");